@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import argparse
+import shutil
+import os
+
+diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+raiz_projeto = os.path.dirname(diretorio_atual)
+tabelas_referencia = os.path.join(raiz_projeto, 'clean_data')
+
+respostas_likert = np.array(["Concordo", "Desconheço", "Discordo"])
+proporcoes_likert = [0.82, 0.06, 0.12]
+linhas_por_bloco = 500000
+
+def ler_perguntas(arquivo):
+    df = pd.read_csv(os.path.join(tabelas_referencia, arquivo))
+    titulo = "QUESTIONARIO" if "QUESTIONARIO" in df.columns else "TITULO"
+    return pd.DataFrame({
+        "ID_QUESTIONARIO": df["ID_QUESTIONARIO"],
+        "QUESTIONARIO": df[titulo],
+        "ID_PERGUNTA": df["ID_PERGUNTA"],
+        "PERGUNTA": df["PERGUNTA"],
+    })
+
+def sortear(rng, tabela, quantidade):
+    return tabela.iloc[rng.integers(0, len(tabela), quantidade)].reset_index(drop=True)
+
+def departamentos():
+    unidades = pd.read_csv(os.path.join(tabelas_referencia, "institucional_unidades.csv"))
+    return unidades.loc[unidades["LOTACAO"].str.startswith("Departamento"), "LOTACAO"].drop_duplicates().to_numpy()
+
+def extras_presenciais(rng, quantidade):
+    disciplinas = pd.read_csv(os.path.join(tabelas_referencia, "presenciais_disciplinas.csv"))
+    df = sortear(rng, disciplinas[["COD_DISCIPLINA", "NOME_DISCIPLINA", "COD_CURSO", "CURSO", "SETOR_CURSO"]], quantidade)
+    df["DEPARTAMENTO"] = rng.choice(departamentos(), quantidade)
+    return df
+
+def extras_cursos(rng, quantidade):
+    cursos = pd.read_csv(os.path.join(tabelas_referencia, "cursos_curso.csv"))
+    return sortear(rng, cursos[["COD_CURSO", "CURSO", "SETOR_CURSO"]], quantidade)
+
+def extras_ead(rng, quantidade):
+    disciplinas = pd.read_csv(os.path.join(tabelas_referencia, "ead_disciplinas.csv"))
+    colunas = ["COD_DISCIPLINA", "NOME_DISCIPLINA", "COD_CURSO", "MULTIPLA_ESCOLHA", "CURSO", "SETOR_CURSO"]
+    df = sortear(rng, disciplinas[colunas], quantidade)
+    df["DEPARTAMENTO"] = "Coordenação de Integração de Políticas de Educação a Distância"
+    df["CODPROF"] = [f"PROF{n:04d}" for n in rng.integers(0, 400, quantidade)]
+    return df
+
+def extras_institucional(rng, quantidade):
+    unidades = pd.read_csv(os.path.join(tabelas_referencia, "institucional_unidades.csv"))
+    return sortear(rng, unidades[["SIGLA_LOTACAO", "LOTACAO"]], quantidade)
+
+exportacoes = {
+    "presenciais_dadosavdisciplinas.csv": ("presenciais_perguntas.csv", extras_presenciais),
+    "cursos_dadosavcursos.csv": ("cursos_perguntas.csv", extras_cursos),
+    "ead_pesq423_discip.csv": ("ead_perguntas.csv", extras_ead),
+    "institucional_pesquisa_442.csv": ("institucional_perguntas.csv", extras_institucional),
+}
+
+def gerar_bloco(rng, perguntas, extras, pesquisas, quantidade):
+    df = sortear(rng, perguntas, quantidade)
+    df.insert(0, "ID_PESQUISA", rng.choice(pesquisas, quantidade))
+    df["RESPOSTA"] = respostas_likert[rng.choice(len(respostas_likert), quantidade, p=proporcoes_likert)]
+    df["SITUACAO"] = np.where(rng.random(quantidade) < 0.97, "Fim respostas", "Início respostas")
+    return pd.concat([df, extras(rng, quantidade)], axis=1)
+
+def gerar_dados(pasta, linhas, semente=0, total_pesquisas=8):
+    os.makedirs(pasta, exist_ok=True)
+    for arquivo in os.listdir(tabelas_referencia):
+        if arquivo.endswith(".csv") and arquivo not in exportacoes:
+            shutil.copy(os.path.join(tabelas_referencia, arquivo), pasta)
+    
+    rng = np.random.default_rng(semente)
+    pesquisas = 40001 + np.arange(total_pesquisas)
+    for arquivo, (arquivo_perguntas, extras) in exportacoes.items():
+        perguntas = ler_perguntas(arquivo_perguntas)
+        destino = os.path.join(pasta, arquivo)
+        for inicio in range(0, linhas, linhas_por_bloco):
+            bloco = gerar_bloco(rng, perguntas, extras, pesquisas, min(linhas_por_bloco, linhas - inicio))
+            bloco.to_csv(destino, index=False, mode="w" if inicio == 0 else "a", header=inicio == 0)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera exportações sintéticas de respostas com os esquemas reais.")
+    parser.add_argument("pasta")
+    parser.add_argument("linhas", type=int)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--pesquisas", type=int, default=8)
+    args = parser.parse_args()
+    gerar_dados(args.pasta, args.linhas, args.semente, args.pesquisas)
@@ -0,0 +1,258 @@
+import pandas as pd
+import argparse
+import importlib
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import sys
+import os
+
+diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+raiz_projeto = os.path.dirname(diretorio_atual)
+sys.path.insert(0, diretorio_atual)
+
+from dados_sinteticos import gerar_dados
+
+versao_gerador = 1
+
+graficos_por_dataset = {
+    "cursos": ["criar_grafico_satisfacao_geral", "criar_grafico_distribuicao_cursos", "criar_grafico_treemap_setor"],
+    "presencial": ["criar_grafico_likert", "criar_grafico_satisfacao_geral", "criar_grafico_treemap_departamento"],
+    "ead": ["criar_grafico_distribuicao_disciplinas_ead", "criar_grafico_satisfacao_geral", "criar_grafico_treemap_disciplinas_ead"],
+    "institucional": [
+        "criar_grafico_satisfacao_geral",
+        "criar_grafico_distribuicao_unidades_institucional",
+        "criar_grafico_treemap_unidades_institucional",
+    ],
+}
+
+def cronometrar(funcao, repeticoes, preparar=None):
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {"mediana_ms": round(statistics.median(tempos), 3), "minimo_ms": round(min(tempos), 3), "amostras": repeticoes}
+
+def chamar_callback(cliente, saida, entradas):
+    ids = [parte.split(".") for parte in saida.strip(".").split("...")]
+    corpo = {
+        "output": saida,
+        "outputs": [{"id": id_saida, "property": propriedade} for id_saida, propriedade in ids],
+        "inputs": entradas,
+        "changedPropIds": [],
+        "state": [],
+    }
+    if not saida.startswith(".."):
+        corpo["outputs"] = corpo["outputs"][0]
+    
+    resposta = cliente.post("/_dash-update-component", json=corpo)
+    if resposta.status_code != 200:
+        raise RuntimeError(f"{saida} respondeu {resposta.status_code}")
+
+def chamar_rota(cliente, caminho):
+    resposta = cliente.get(caminho)
+    if resposta.status_code != 200:
+        raise RuntimeError(f"{caminho} respondeu {resposta.status_code}")
+
+def medir(pasta_dados, pasta_cache, repeticoes):
+    os.environ.update({
+        "DASHBOARD_DADOS_DIR": pasta_dados,
+        "DASHBOARD_CACHE_DIR": pasta_cache,
+        "DASHBOARD_CACHE_FIGURAS": "0",
+        "DASHBOARD_CACHE_BACKEND": "memoria",
+        "DASHBOARD_PARTICOES_MEMORIA": "0",
+        "DASHBOARD_AQUECIMENTO": "0",
+        "DASHBOARD_RECARGA_INTERVALO": "0",
+    })
+    sys.path.insert(0, os.path.join(raiz_projeto, "src"))
+    
+    inicio = time.perf_counter()
+    painel = importlib.import_module("app")
+    sys.stderr = sys.__stderr__
+    resultado = {"importacao": {"fria": {"mediana_ms": round((time.perf_counter() - inicio) * 1000, 3), "minimo_ms": None, "amostras": 1}}}
+    
+    def limpar_cache(nome):
+        shutil.rmtree(os.path.join(pasta_cache, f"{nome}_cubo"), ignore_errors=True)
+        if os.path.exists(os.path.join(pasta_cache, f"{nome}.json")):
+            os.remove(os.path.join(pasta_cache, f"{nome}.json"))
+    
+    def carregar_particoes(cubo):
+        for codigo in cubo["particoes"]:
+            painel.particoes_carregadas.obter(cubo, codigo)
+    
+    carregadores, processamento, linhas_cubo = {}, {}, {}
+    for nome, (processar, arquivos) in painel.fontes_datasets.items():
+        carregadores[f"{nome}/sem_cache"] = cronometrar(
+            lambda: painel.carregar_dataset(nome, {}), repeticoes, preparar=lambda: limpar_cache(nome)
+        )
+        carregadores[f"{nome}/com_cache"] = cronometrar(lambda: painel.carregar_dataset(nome, {}), repeticoes)
+        
+        cubo = painel.carregar_dataset(nome, {})
+        carregadores[f"{nome}/particoes"] = cronometrar(
+            lambda: carregar_particoes(cubo), repeticoes, preparar=painel.particoes_carregadas.itens.clear
+        )
+        linhas_cubo[nome] = int(sum(len(painel.particoes_carregadas.obter(cubo, codigo)[0]) for codigo in cubo["particoes"]))
+        
+        respostas, *tabelas = [os.path.join(pasta_dados, arquivo) for arquivo in arquivos]
+        tabelas = [pd.read_csv(respostas, nrows=painel.tamanho_bloco_leitura)] + [pd.read_csv(caminho) for caminho in tabelas]
+        processamento[processar.__name__] = cronometrar(lambda: processar(*tabelas), repeticoes)
+    
+    resultado["carregadores"] = carregadores
+    resultado["processamento"] = processamento
+    resultado["linhas_cubo"] = linhas_cubo
+    
+    dados = painel.dados_atuais
+    etapas, graficos = {}, {}
+    for nome, funcoes in graficos_por_dataset.items():
+        cubo = dados["cubos"][nome]
+        fatos = painel.filtrar_linhas(cubo, [("ID_PESQUISA", None)])
+        dff = painel.agregar_respostas(nome, cubo, fatos)
+        etapas[f"{nome}/filtrar_linhas"] = cronometrar(lambda: painel.filtrar_linhas(cubo, [("ID_PESQUISA", None)]), repeticoes)
+        etapas[f"{nome}/agregar_respostas"] = cronometrar(lambda: painel.agregar_respostas(nome, cubo, fatos), repeticoes)
+        for funcao in funcoes:
+            graficos[f"{nome}/{funcao}"] = cronometrar(lambda: getattr(painel, funcao)(dff), repeticoes)
+    
+    resultado["etapas"] = etapas
+    resultado["graficos"] = graficos
+    
+    cliente = painel.server.test_client()
+    callbacks = {}
+    for aba in painel.layouts_abas:
+        callbacks[f"render_conteudo/{aba}"] = cronometrar(lambda: chamar_rota(cliente, f"/_dash-abas/{aba}"), repeticoes)
+    
+    for saida, callback in painel.app.callback_map.items():
+        if ".figure" not in saida:
+            continue
+        
+        id_filtro = callback["inputs"][0]["id"]
+        dataset = id_filtro.rsplit("-", 1)[1]
+        opcoes_ids = dados["metadados"][dataset]["opcoes_ids"]
+        cenarios = {"sem_filtro": None}
+        if opcoes_ids:
+            cenarios["uma_pesquisa"] = [opcoes_ids[0]["value"]]
+        
+        for cenario, ids in cenarios.items():
+            entradas = [dict(entrada, value=None) for entrada in callback["inputs"]]
+            entradas[0]["value"] = ids
+            callbacks[f"atualizar_graficos_{dataset}/{cenario}"] = cronometrar(
+                lambda: chamar_callback(cliente, saida, entradas), repeticoes
+            )
+    
+    resultado["callbacks"] = callbacks
+    return resultado
+
+def ambiente():
+    import numpy, pandas, plotly, dash
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=raiz_projeto, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "processadores": os.cpu_count(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "plotly": plotly.__version__,
+        "dash": dash.__version__,
+    }
+
+def preparar_dados(pasta_base, linhas, semente):
+    pasta = os.path.join(pasta_base, f"dados_{linhas}_{semente}")
+    caminho_marcador = os.path.join(pasta, "gerado.json")
+    marcador = {"versao": versao_gerador, "linhas": linhas, "semente": semente}
+    if os.path.exists(caminho_marcador):
+        with open(caminho_marcador, encoding="utf-8") as f:
+            if json.load(f) == marcador:
+                return pasta
+    
+    shutil.rmtree(pasta, ignore_errors=True)
+    gerar_dados(pasta, linhas, semente)
+    with open(caminho_marcador, "w", encoding="utf-8") as f:
+        json.dump(marcador, f)
+    return pasta
+
+def executar(escalas, repeticoes, pasta_base, semente):
+    resultados = {"gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"), "ambiente": ambiente(), "repeticoes": repeticoes, "escalas": {}}
+    for linhas in escalas:
+        print(f"{linhas} linhas: gerando dados...", flush=True)
+        pasta_dados = preparar_dados(pasta_base, linhas, semente)
+        
+        pasta_cache = tempfile.mkdtemp(prefix="cache_", dir=pasta_base)
+        saida = os.path.join(pasta_cache, "resultado.json")
+        try:
+            print(f"{linhas} linhas: medindo...", flush=True)
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--medir", pasta_dados, pasta_cache, saida, "--repeticoes", str(repeticoes)],
+                check=True,
+            )
+            with open(saida, encoding="utf-8") as f:
+                resultados["escalas"][str(linhas)] = json.load(f)
+        finally:
+            shutil.rmtree(pasta_cache, ignore_errors=True)
+    return resultados
+
+def achatar(resultados):
+    valores = {}
+    for escala, grupos in resultados["escalas"].items():
+        for grupo, medidas in grupos.items():
+            for nome, medida in medidas.items():
+                if isinstance(medida, dict):
+                    valores[f"{escala}/{grupo}/{nome}"] = medida["mediana_ms"]
+    return valores
+
+def comparar(base, atual, tolerancia):
+    anteriores, novos = achatar(base), achatar(atual)
+    regressoes = []
+    for chave in sorted(set(anteriores) & set(novos)):
+        razao = novos[chave] / anteriores[chave] if anteriores[chave] else float("inf")
+        marca = ""
+        if razao > tolerancia:
+            marca = "  << regressão"
+            regressoes.append(chave)
+        print(f"{chave:<90} {anteriores[chave]:>12.3f} {novos[chave]:>12.3f} {razao:>7.2f}x{marca}")
+    return regressoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do dashboard com dados sintéticos.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--pasta", default=os.path.join(raiz_projeto, ".cache", "benchmarks"))
+    parser.add_argument("--saida", default="benchmark.json")
+    parser.add_argument("--comparar", metavar="BASE")
+    parser.add_argument("--tolerancia", type=float, default=1.25)
+    parser.add_argument("--medir", nargs=3, metavar=("DADOS", "CACHE", "SAIDA"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.medir:
+        pasta_dados, pasta_cache, saida = args.medir
+        resultado = medir(pasta_dados, pasta_cache, args.repeticoes)
+        with open(saida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f)
+        sys.exit(0)
+    
+    os.makedirs(args.pasta, exist_ok=True)
+    resultados = executar(args.linhas, args.repeticoes, args.pasta, args.semente)
+    with open(args.saida, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {args.saida}")
+    
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = comparar(base, resultados, args.tolerancia)
+        if regressoes:
+            print(f"{len(regressoes)} medidas acima de {args.tolerancia}x da base")
+            sys.exit(1)
@@ -0,0 +1,31 @@
+import gc
+import glob
+import os
+import shutil
+
+os.environ.setdefault("DASHBOARD_PRELOAD", "1")
+pasta_cache = os.environ.get("DASHBOARD_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+os.environ.setdefault("DASHBOARD_METRICAS_DIR", os.path.join(pasta_cache, "metricas"))
+
+preload_app = os.environ["DASHBOARD_PRELOAD"] == "1"
+
+def on_starting(server):
+    shutil.rmtree(os.environ["DASHBOARD_METRICAS_DIR"], ignore_errors=True)
+
+def child_exit(server, worker):
+    for arquivo in glob.glob(os.path.join(os.environ["DASHBOARD_METRICAS_DIR"], f"{worker.pid}-*")):
+        try:
+            os.remove(arquivo)
+        except OSError:
+            pass
+
+def pre_fork(server, worker):
+    gc.freeze()
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from src import app
+        app.iniciar_monitoramento()
+        app.iniciar_gravacao_metricas()
+        app.iniciar_registro_acessos()
+        app.iniciar_aquecimento(app.dados_atuais)
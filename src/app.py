@@ -1,34 +1,271 @@
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from dash.exceptions import PreventUpdate
 import dash
-from dash import Dash, html, dcc, Input, Output
+from dash import Dash, html, dcc, Input, Output, State
+from plotly.io.json import to_json_plotly
+from plotly.offline import get_plotlyjs_version
+from flask import g, has_request_context, request
+from collections import Counter, OrderedDict, deque
+import atexit
+import base64
+import bisect
+import cProfile
+import functools
+import gzip
 import logging
+import hashlib
+import hmac
+import json
+import pstats
+import sqlite3
+import threading
+import time
+import unicodedata
 import sys
 import os
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
-clean_data_path = os.path.join(project_root, 'clean_data')
+clean_data_path = os.environ.get("DASHBOARD_DADOS_DIR", os.path.join(project_root, 'clean_data'))
+
+cache_dir = os.environ.get("DASHBOARD_CACHE_DIR", os.path.join(project_root, '.cache'))
+versao_cache = 8
+tamanho_cache_figuras = int(os.environ.get("DASHBOARD_CACHE_FIGURAS", "256"))
+backend_cache_figuras = os.environ.get("DASHBOARD_CACHE_BACKEND", "memoria")
+tamanho_cache_compartilhado = int(os.environ.get("DASHBOARD_CACHE_COMPARTILHADO", "2048"))
+expiracao_cache_compartilhado = int(os.environ.get("DASHBOARD_CACHE_TTL", "86400"))
+limite_busca_opcoes = int(os.environ.get("DASHBOARD_LIMITE_BUSCA", "50"))
+validar_figuras = os.environ.get("DASHBOARD_VALIDAR_FIGURAS", "0") == "1"
+tamanho_bloco_leitura = int(os.environ.get("DASHBOARD_BLOCO_LEITURA", "200000"))
+intervalo_recarga = float(os.environ.get("DASHBOARD_RECARGA_INTERVALO", "30"))
+particoes_em_memoria = int(os.environ.get("DASHBOARD_PARTICOES_MEMORIA", "64"))
+retencao_particoes = 3600
+carregar_no_master = os.environ.get("DASHBOARD_PRELOAD") == "1"
+aquecimento_ativo = os.environ.get("DASHBOARD_AQUECIMENTO", "1") == "1"
+combinacoes_aquecimento = int(os.environ.get("DASHBOARD_AQUECIMENTO_POPULARES", "20"))
+registro_acessos = 200
+decaimento_acessos = 0.9
+periodo_decaimento = 86400
+intervalo_acessos = 300
+token_perfil = os.environ.get("DASHBOARD_PERFIL_TOKEN", "")
+limite_perfil = float(os.environ.get("DASHBOARD_PERFIL_LIMITE", "0"))
+intervalo_amostragem = 0.005
+quadros_perfil = 25
+arrays_binarios = tuple(int(parte) for parte in get_plotlyjs_version().split(".")[:2]) >= (2, 28)
+tamanho_minimo_binario = 16
+compressao_minima = int(os.environ.get("DASHBOARD_COMPRESSAO_MINIMA", "1024"))
+nivel_gzip = 6
+qualidade_brotli = 5
+tipos_comprimiveis = ("text/html", "text/css", "text/plain", "text/javascript", "application/json", "application/javascript")
+rotas_condicionais = ("/_dash-layout", "/_dash-dependencies", "/_dash-abas/")
+
+ordem_likert = ["Discordo", "Desconheço", "Concordo"]
+valores_likert = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
+
+pasta_metricas = os.environ.get("DASHBOARD_METRICAS_DIR", "")
+intervalo_metricas = 5
+
+limites_duracao = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+limites_tamanho = (1000, 5000, 10000, 25000, 50000, 100000, 250000, 500000, 1000000, 5000000)
+
+def formatar_rotulos(nomes, valores):
+    partes = []
+    for nome, valor in zip(nomes, valores):
+        valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        partes.append(f'{nome}="{valor}"')
+    return ",".join(partes)
+
+class Histograma:
+    def __init__(self, nome, descricao, rotulos, limites):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self.limites = limites
+        self.series = {}
+        self.lock = threading.Lock()
+    
+    def observar(self, valor, *rotulos):
+        if getattr(contexto_metricas, "aquecimento", False):
+            return
+        
+        posicao = bisect.bisect_left(self.limites, valor)
+        with self.lock:
+            serie = self.series.get(rotulos)
+            if serie is None:
+                serie = self.series[rotulos] = {"baldes": [0] * (len(self.limites) + 1), "soma": 0.0, "total": 0}
+            serie["baldes"][posicao] += 1
+            serie["soma"] += valor
+            serie["total"] += 1
+    
+    def copiar(self):
+        with self.lock:
+            return {rotulos: dict(serie, baldes=list(serie["baldes"])) for rotulos, serie in self.series.items()}
+    
+    def combinar(self, series, rotulos, serie):
+        atual = series.get(rotulos)
+        if atual is None:
+            series[rotulos] = dict(serie, baldes=list(serie["baldes"]))
+            return
+        
+        atual["baldes"] = [a + b for a, b in zip(atual["baldes"], serie["baldes"])]
+        atual["soma"] += serie["soma"]
+        atual["total"] += serie["total"]
+    
+    def exportar(self, series):
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} histogram"]
+        for rotulos, serie in sorted(series.items()):
+            base = formatar_rotulos(self.rotulos, rotulos)
+            prefixo = base + "," if base else ""
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + ("+Inf",), serie["baldes"]):
+                acumulado += quantidade
+                linhas.append(f'{self.nome}_bucket{{{prefixo}le="{limite}"}} {acumulado}')
+            linhas.append(f"{self.nome}_sum{{{base}}} {serie['soma']}")
+            linhas.append(f"{self.nome}_count{{{base}}} {serie['total']}")
+        return linhas
+
+class Contador:
+    def __init__(self, nome, descricao, rotulos):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = rotulos
+        self.series = Counter()
+        self.lock = threading.Lock()
+    
+    def incrementar(self, *rotulos):
+        if getattr(contexto_metricas, "aquecimento", False):
+            return
+        
+        with self.lock:
+            self.series[rotulos] += 1
+    
+    def copiar(self):
+        with self.lock:
+            return dict(self.series)
+    
+    def combinar(self, series, rotulos, total):
+        series[rotulos] = series.get(rotulos, 0) + total
+    
+    def exportar(self, series):
+        linhas = [f"# HELP {self.nome} {self.descricao}", f"# TYPE {self.nome} counter"]
+        for rotulos, total in sorted(series.items()):
+            linhas.append(f"{self.nome}{{{formatar_rotulos(self.rotulos, rotulos)}}} {total}")
+        return linhas
+
+duracao_callbacks = Histograma(
+    "dashboard_callback_duracao_segundos", "Duração total dos callbacks do Dash.",
+    ("callback",), limites_duracao,
+)
+duracao_etapas = Histograma(
+    "dashboard_etapa_duracao_segundos", "Duração de cada etapa (filtro, agregação, figura, serialização) dos gráficos.",
+    ("callback", "etapa", "funcao"), limites_duracao,
+)
+tamanho_respostas = Histograma(
+    "dashboard_figuras_bytes", "Tamanho em bytes do JSON das figuras de cada callback.",
+    ("callback",), limites_tamanho,
+)
+consultas_cache_figuras = Contador(
+    "dashboard_cache_figuras_total", "Consultas ao cache de figuras por resultado.",
+    ("callback", "resultado"),
+)
+metricas = [duracao_callbacks, duracao_etapas, tamanho_respostas, consultas_cache_figuras]
+contexto_metricas = threading.local()
+
+def medir_callback(funcao):
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            duracao_callbacks.observar(time.perf_counter() - inicio, funcao.__name__)
+    return envoltorio
 
-df_pres_resp = pd.read_csv(os.path.join(clean_data_path, "presenciais_dadosavdisciplinas.csv"))
-df_pres_q = pd.read_csv(os.path.join(clean_data_path, "presenciais_perguntas.csv"))
-df_pres_disc = pd.read_csv(os.path.join(clean_data_path, "presenciais_disciplinas.csv"))
+def medir_etapa(etapa):
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                callback = getattr(contexto_metricas, "callback", "")
+                duracao_etapas.observar(time.perf_counter() - inicio, callback, etapa, funcao.__name__)
+        return envoltorio
+    return decorador
 
-df_curso_resp = pd.read_csv(os.path.join(clean_data_path, "cursos_dadosavcursos.csv"))
-df_curso_q = pd.read_csv(os.path.join(clean_data_path, "cursos_perguntas.csv"))
-df_curso_info = pd.read_csv(os.path.join(clean_data_path, "cursos_curso.csv"))
+identificador_processo = f"{os.getpid()}-{os.urandom(4).hex()}"
 
-df_ead_resp = pd.read_csv(os.path.join(clean_data_path, "ead_pesq423_discip.csv"))
-df_ead_q = pd.read_csv(os.path.join(clean_data_path, "ead_perguntas.csv"))
-df_ead_disc = pd.read_csv(os.path.join(clean_data_path, "ead_disciplinas.csv"))
+def reiniciar_metricas():
+    global identificador_processo
+    identificador_processo = f"{os.getpid()}-{os.urandom(4).hex()}"
+    for metrica in metricas:
+        with metrica.lock:
+            metrica.series = type(metrica.series)()
 
-df_inst_resp = pd.read_csv(os.path.join(clean_data_path, "institucional_pesquisa_442.csv"))
-df_inst_q = pd.read_csv(os.path.join(clean_data_path, "institucional_perguntas.csv"))
-df_inst_unidades = pd.read_csv(os.path.join(clean_data_path, "institucional_unidades.csv"))
+os.register_at_fork(after_in_child=reiniciar_metricas)
 
-def processar_dados_presenciais():
+def gravar_metricas():
+    if not pasta_metricas:
+        return
+    
+    conteudo = {metrica.nome: [[list(rotulos), valor] for rotulos, valor in metrica.copiar().items()] for metrica in metricas}
+    try:
+        os.makedirs(pasta_metricas, exist_ok=True)
+        gravar_json(os.path.join(pasta_metricas, f"{identificador_processo}.json"), conteudo)
+    except OSError:
+        pass
+
+def gravar_metricas_periodicamente():
+    while True:
+        time.sleep(intervalo_metricas)
+        gravar_metricas()
+
+def iniciar_gravacao_metricas():
+    if pasta_metricas:
+        threading.Thread(target=gravar_metricas_periodicamente, name="gravacao-metricas", daemon=True).start()
+
+def exportar_metricas():
+    if not pasta_metricas:
+        combinadas = {metrica.nome: metrica.copiar() for metrica in metricas}
+    else:
+        gravar_metricas()
+        combinadas = {metrica.nome: {} for metrica in metricas}
+        arquivos = os.listdir(pasta_metricas) if os.path.isdir(pasta_metricas) else []
+        for arquivo in arquivos:
+            if not arquivo.endswith(".json"):
+                continue
+            
+            conteudo = ler_json(os.path.join(pasta_metricas, arquivo))
+            for metrica in metricas:
+                for rotulos, valor in conteudo.get(metrica.nome, []):
+                    metrica.combinar(combinadas[metrica.nome], tuple(rotulos), valor)
+    
+    linhas = []
+    for metrica in metricas:
+        linhas += metrica.exportar(combinadas[metrica.nome])
+    return "\n".join(linhas) + "\n"
+
+def processar_dados_presenciais(df_pres_resp, df_pres_q, df_pres_disc):
     df = df_pres_resp.merge(df_pres_q, on=["ID_PERGUNTA", "ID_QUESTIONARIO"], how="left")
     df = df.merge(df_pres_disc, on=["COD_DISCIPLINA", "COD_CURSO"], how="left", suffixes=("_x", "_DISC"))
     
@@ -38,7 +275,7 @@ def processar_dados_presenciais():
     
     return df
 
-def processar_dados_cursos():
+def processar_dados_cursos(df_curso_resp, df_curso_q, df_curso_info):
     df = df_curso_resp.merge(df_curso_q, on=["ID_PERGUNTA", "ID_QUESTIONARIO"], how="left")
     df = df.merge(df_curso_info, on="COD_CURSO", how="left")
     
@@ -49,7 +286,7 @@ def processar_dados_cursos():
     
     return df
 
-def processar_dados_ead():
+def processar_dados_ead(df_ead_resp, df_ead_q, df_ead_disc):
     df = df_ead_resp.merge(df_ead_q, on=["ID_PERGUNTA", "ID_QUESTIONARIO"], how="left")
     df = df.merge(df_ead_disc, on=["COD_DISCIPLINA", "COD_CURSO"], how="left", suffixes=("_x", "_DISC"))
     
@@ -62,7 +299,7 @@ def processar_dados_ead():
     
     return df
 
-def processar_dados_institucional():
+def processar_dados_institucional(df_inst_resp, df_inst_q, df_inst_unidades):
     df = df_inst_resp.merge(df_inst_q, on=["ID_PERGUNTA", "ID_QUESTIONARIO"], how="left")
     df = df.merge(df_inst_unidades, on="SIGLA_LOTACAO", how="left")
     
@@ -79,12 +316,481 @@ def processar_dados_institucional():
     
     return df
 
-df_presencial = processar_dados_presenciais()
-df_cursos = processar_dados_cursos()
-df_ead = processar_dados_ead()
-df_institucional = processar_dados_institucional()
+fontes_datasets = {
+    "presencial": (processar_dados_presenciais, ["presenciais_dadosavdisciplinas.csv", "presenciais_perguntas.csv", "presenciais_disciplinas.csv"]),
+    "cursos": (processar_dados_cursos, ["cursos_dadosavcursos.csv", "cursos_perguntas.csv", "cursos_curso.csv"]),
+    "ead": (processar_dados_ead, ["ead_pesq423_discip.csv", "ead_perguntas.csv", "ead_disciplinas.csv"]),
+    "institucional": (processar_dados_institucional, ["institucional_pesquisa_442.csv", "institucional_perguntas.csv", "institucional_unidades.csv"]),
+}
 
-ordem_likert = ["Discordo", "Desconheço", "Concordo"]
+def categorias_para_texto(df):
+    return df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+def assinatura_arquivo(caminho, anterior=None):
+    stat = os.stat(caminho)
+    if anterior and anterior.get("mtime") == stat.st_mtime_ns and anterior.get("tamanho") == stat.st_size:
+        return anterior
+    
+    corte = anterior.get("tamanho", 0) if anterior and anterior.get("tamanho", 0) < stat.st_size else 0
+    sha = hashlib.sha256()
+    prefixo = None
+    lidos = 0
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            if lidos < corte <= lidos + len(bloco):
+                posicao = corte - lidos
+                sha.update(bloco[:posicao])
+                if bloco[posicao - 1:posicao] == b"\n":
+                    prefixo = sha.hexdigest()
+                sha.update(bloco[posicao:])
+            else:
+                sha.update(bloco)
+            lidos += len(bloco)
+    
+    assinatura = {"mtime": stat.st_mtime_ns, "tamanho": stat.st_size, "sha256": sha.hexdigest()}
+    if prefixo is not None and prefixo == anterior.get("sha256"):
+        assinatura["anexo_de"] = prefixo
+    return assinatura
+
+def ler_json(caminho):
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def gravar_atomico(caminho, escrever):
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        escrever(temporario)
+        os.replace(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def gravar_json(caminho, conteudo):
+    def escrever(destino):
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(conteudo, f, indent=2)
+    gravar_atomico(caminho, escrever)
+
+dimensoes_cubo = {
+    "presencial": ["ID_PESQUISA", "CURSO", "DEPARTAMENTO", "PERGUNTA", "RESPOSTA"],
+    "cursos": ["ID_PESQUISA", "CURSO", "SETOR_CURSO", "PERGUNTA", "RESPOSTA"],
+    "ead": ["ID_PESQUISA", "CURSO", "NOME_DISCIPLINA", "COD_DISCIPLINA", "PERGUNTA", "RESPOSTA"],
+    "institucional": ["ID_PESQUISA", "LOTACAO", "SIGLA_LOTACAO", "PERGUNTA", "RESPOSTA"],
+}
+
+def ler_blocos(processar, arquivos, inicio=0):
+    respostas, *tabelas = [os.path.join(clean_data_path, arquivo) for arquivo in arquivos]
+    tabelas = [pd.read_csv(caminho) for caminho in tabelas]
+    colunas = pd.read_csv(respostas, nrows=0).columns
+    
+    with open(respostas, "rb") as f:
+        f.seek(inicio)
+        opcoes = {"header": None, "names": colunas} if inicio else {}
+        try:
+            leitor = pd.read_csv(f, chunksize=tamanho_bloco_leitura, **opcoes)
+        except pd.errors.EmptyDataError:
+            return
+        
+        for bloco in leitor:
+            yield processar(bloco, *tabelas)
+
+def somar_parciais(parciais, dimensoes):
+    return (
+        pd.concat(parciais, ignore_index=True)
+        .groupby(dimensoes, dropna=False)["Quantidade"]
+        .sum()
+        .reset_index()
+    )
+
+def finalizar_cubo(cubo, dimensoes):
+    for col in dimensoes:
+        if cubo[col].dtype == object:
+            cubo[col] = cubo[col].astype("category")
+        elif pd.api.types.is_integer_dtype(cubo[col]):
+            cubo[col] = pd.to_numeric(cubo[col], downcast="integer")
+    
+    return cubo
+
+def fixar_particoes(dados):
+    for cubo in dados["cubos"].values():
+        for codigo, particao in cubo["particoes"].items():
+            particao["carregada"] = particoes_carregadas.obter(cubo, codigo)
+
+def construir_cubo(nome, blocos):
+    dimensoes = None
+    parciais = []
+    linhas_parciais = 0
+    
+    for df in blocos:
+        if dimensoes is None:
+            dimensoes = [col for col in dimensoes_cubo[nome] if col in df.columns]
+        
+        parciais.append(df.groupby(dimensoes, dropna=False).size().reset_index(name="Quantidade"))
+        linhas_parciais += len(parciais[-1])
+        if linhas_parciais > tamanho_bloco_leitura:
+            parciais = [somar_parciais(parciais, dimensoes)]
+            linhas_parciais = len(parciais[0])
+    
+    if not parciais:
+        return None
+    
+    return finalizar_cubo(somar_parciais(parciais, dimensoes), dimensoes)
+
+def codificar_cubo(cubo, dimensoes):
+    dimensoes = dict(dimensoes)
+    fatos = pd.DataFrame({"Quantidade": cubo["Quantidade"].to_numpy()})
+    for col in cubo.columns.drop("Quantidade"):
+        if isinstance(cubo[col].dtype, pd.CategoricalDtype):
+            codigos, valores = cubo[col].cat.codes.to_numpy(), cubo[col].cat.categories
+        else:
+            codigos, valores = pd.factorize(cubo[col], sort=True)
+            valores = pd.Index(valores)
+        
+        rotulos = dimensoes.get(col)
+        rotulos = valores if rotulos is None else rotulos.append(valores.difference(rotulos))
+        dimensoes[col] = rotulos
+        
+        mapa = np.append(rotulos.get_indexer(valores), -1)
+        fatos[col] = pd.to_numeric(mapa[codigos], downcast="integer")
+    
+    return fatos, dimensoes
+
+def compactar_codigos(fatos):
+    for col in fatos.columns.drop("Quantidade"):
+        fatos[col] = pd.to_numeric(fatos[col], downcast="integer")
+    return fatos
+
+def nome_particao(rotulos_id, codigo):
+    return "sem_id" if codigo < 0 else str(rotulos_id[codigo])
+
+def limpar_particoes(pasta, particoes, removidas):
+    validos = set(particoes.values())
+    agora = time.time()
+    pendentes = {}
+    for arquivo in os.listdir(pasta):
+        if not arquivo.endswith(".parquet") or arquivo in validos:
+            continue
+        
+        desde = removidas.get(arquivo, agora)
+        if desde > agora - retencao_particoes:
+            pendentes[arquivo] = desde
+            continue
+        try:
+            os.remove(os.path.join(pasta, arquivo))
+        except OSError:
+            pendentes[arquivo] = desde
+    return pendentes
+
+dimensoes_graficos = {
+    "presencial": ["PERGUNTA", "DEPARTAMENTO"],
+    "cursos": ["CURSO", "SETOR_CURSO"],
+    "ead": ["NOME_DISCIPLINA", "COD_DISCIPLINA"],
+    "institucional": ["LOTACAO", "SIGLA_LOTACAO"],
+}
+
+@medir_etapa("agregacao")
+def agregar_respostas(nome, cubo, fatos):
+    dimensoes = [col for col in dimensoes_graficos[nome] if col in cubo["dimensoes"]] + ["RESPOSTA"]
+    agregado = fatos.groupby(dimensoes)["Quantidade"].sum().reset_index()
+    
+    for col in dimensoes:
+        agregado[col] = pd.Categorical.from_codes(agregado[col], cubo["dimensoes"][col]).astype(object)
+    
+    agregado["valor_num"] = agregado["RESPOSTA"].map(valores_likert).astype(float)
+    return agregado
+
+def construir_indice(fatos, dimensoes, colunas):
+    indice = {}
+    for coluna in colunas:
+        codigos = fatos[coluna].to_numpy()
+        valores = dimensoes[coluna]
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(len(valores) + 1))
+        indice[coluna] = {
+            "codigos": codigos,
+            "posicoes": {valor: codigo for codigo, valor in enumerate(valores)},
+            "linhas": [ordem[limites[i]:limites[i + 1]] for i in range(len(valores))],
+        }
+    return indice
+
+def resolver_filtros(indice, filtros):
+    selecoes = []
+    for coluna, valores in filtros:
+        if not valores:
+            continue
+        
+        entrada = indice[coluna]
+        codigos = [entrada["posicoes"][valor] for valor in valores if valor in entrada["posicoes"]]
+        total_linhas = sum(len(entrada["linhas"][codigo]) for codigo in codigos)
+        selecoes.append((total_linhas, coluna, codigos))
+    
+    if not selecoes:
+        return None
+    
+    selecoes.sort(key=lambda selecao: selecao[0])
+    _, coluna, codigos = selecoes[0]
+    if not codigos:
+        return np.empty(0, dtype=np.intp)
+    
+    linhas = np.sort(np.concatenate([indice[coluna]["linhas"][codigo] for codigo in codigos]))
+    for _, coluna, codigos in selecoes[1:]:
+        entrada = indice[coluna]
+        permitidos = np.zeros(len(entrada["linhas"]) + 1, dtype=bool)
+        permitidos[codigos] = True
+        linhas = linhas[permitidos[entrada["codigos"][linhas]]]
+    
+    return linhas
+
+class ParticoesEmMemoria:
+    def __init__(self, tamanho_maximo):
+        self.tamanho_maximo = tamanho_maximo
+        self.itens = OrderedDict()
+        self.lock = threading.Lock()
+    
+    def obter(self, cubo, codigo):
+        particao = cubo["particoes"][codigo]
+        if particao["carregada"] is not None:
+            return particao["carregada"]
+        
+        with self.lock:
+            carregada = self.itens.get(particao["arquivo"])
+            if carregada is not None:
+                self.itens.move_to_end(particao["arquivo"])
+                return carregada
+        
+        fatos = pd.read_parquet(particao["arquivo"])
+        carregada = (fatos, construir_indice(fatos, cubo["dimensoes"], cubo["colunas_indice"]))
+        self.guardar(particao["arquivo"], carregada)
+        return carregada
+    
+    def guardar(self, arquivo, carregada):
+        with self.lock:
+            self.itens[arquivo] = carregada
+            self.itens.move_to_end(arquivo)
+            while self.tamanho_maximo > 0 and len(self.itens) > self.tamanho_maximo:
+                self.itens.popitem(last=False)
+
+particoes_carregadas = ParticoesEmMemoria(particoes_em_memoria)
+
+def montar_cubo(nome, pasta, arquivos, dimensoes, carregadas):
+    vazio = {col: pd.Series(dtype="int8") for col in dimensoes}
+    vazio["Quantidade"] = pd.Series(dtype="int64")
+    cubo = {"dimensoes": dimensoes, "particoes": {}, "vazio": pd.DataFrame(vazio)}
+    cubo["colunas_indice"] = [coluna_curso(nome, cubo)]
+    
+    for codigo, arquivo in arquivos.items():
+        cubo["particoes"][int(codigo)] = {"arquivo": os.path.join(pasta, arquivo), "carregada": None}
+    
+    for codigo, fatos in carregadas.items():
+        carregada = (fatos, construir_indice(fatos, dimensoes, cubo["colunas_indice"]))
+        if codigo in cubo["particoes"]:
+            particoes_carregadas.guardar(cubo["particoes"][codigo]["arquivo"], carregada)
+        else:
+            cubo["particoes"][codigo] = {"arquivo": None, "carregada": carregada}
+    
+    return cubo
+
+@medir_etapa("filtro")
+def filtrar_linhas(cubo, filtros):
+    (coluna_particao, valores), *demais = filtros
+    if valores:
+        codigos = sorted({codigo for codigo in cubo["dimensoes"][coluna_particao].get_indexer(valores) if codigo >= 0})
+    else:
+        codigos = list(cubo["particoes"])
+    
+    partes = []
+    for codigo in codigos:
+        if codigo not in cubo["particoes"]:
+            continue
+        
+        fatos, indice = particoes_carregadas.obter(cubo, codigo)
+        linhas = resolver_filtros(indice, demais)
+        partes.append(fatos if linhas is None else fatos.take(linhas))
+    
+    if not partes:
+        return cubo["vazio"]
+    if len(partes) == 1:
+        return partes[0]
+    return pd.concat(partes, ignore_index=True)
+
+def carregar_dataset(nome, assinaturas, anterior=None):
+    processar, arquivos = fontes_datasets[nome]
+    pasta_particoes = os.path.join(cache_dir, f"{nome}_cubo")
+    caminho_manifesto = os.path.join(cache_dir, f"{nome}.json")
+    
+    manifesto = ler_json(caminho_manifesto)
+    if manifesto.get("versao") != versao_cache:
+        manifesto = {}
+    fontes_anteriores = manifesto.get("fontes", {})
+    particoes = manifesto.get("particoes", {})
+    dimensoes = {col: pd.Index(rotulos) for col, rotulos in manifesto.get("dimensoes", {}).items()}
+    fontes = {
+        arquivo: assinatura_arquivo(os.path.join(clean_data_path, arquivo), fontes_anteriores.get(arquivo))
+        for arquivo in arquivos
+    }
+    
+    hashes_atuais = {arquivo: info["sha256"] for arquivo, info in fontes.items()}
+    hashes_cache = {arquivo: info.get("sha256") for arquivo, info in fontes_anteriores.items()}
+    assinaturas[nome] = hashes_atuais
+    
+    if anterior is not None and anterior["assinaturas"].get(nome) == hashes_atuais:
+        return anterior["cubos"][nome]
+    
+    particoes_existem = "particoes" in manifesto and all(
+        os.path.exists(os.path.join(pasta_particoes, arquivo)) for arquivo in particoes.values()
+    )
+    
+    if hashes_atuais == hashes_cache and particoes_existem:
+        if fontes != fontes_anteriores:
+            gravar_json(caminho_manifesto, dict(manifesto, fontes=fontes))
+        return montar_cubo(nome, pasta_particoes, particoes, dimensoes, {})
+    
+    respostas, *tabelas = arquivos
+    anexado = (
+        particoes_existem
+        and hashes_cache.get(respostas) is not None
+        and fontes[respostas].get("anexo_de") == hashes_cache[respostas]
+        and all(hashes_atuais[arquivo] == hashes_cache.get(arquivo) for arquivo in tabelas)
+    )
+    
+    if anexado:
+        cubo = construir_cubo(nome, ler_blocos(processar, arquivos, inicio=fontes_anteriores[respostas]["tamanho"]))
+    else:
+        particoes, dimensoes = {}, {}
+        cubo = construir_cubo(nome, ler_blocos(processar, arquivos))
+    
+    carregadas = {}
+    if cubo is not None:
+        fatos, dimensoes = codificar_cubo(cubo, dimensoes)
+        for codigo, parte in fatos.groupby("ID_PESQUISA"):
+            parte = parte.reset_index(drop=True)
+            if str(codigo) in particoes:
+                existente = pd.read_parquet(os.path.join(pasta_particoes, particoes[str(codigo)]))
+                parte = compactar_codigos(somar_parciais([existente, parte], list(dimensoes)))
+            carregadas[int(codigo)] = parte
+    
+    rotulos = {col: valores.tolist() for col, valores in dimensoes.items()}
+    sufixo = hashlib.sha256(json.dumps([hashes_atuais, rotulos], sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    try:
+        os.makedirs(pasta_particoes, exist_ok=True)
+        for codigo, parte in carregadas.items():
+            arquivo = f"{nome_particao(dimensoes['ID_PESQUISA'], codigo)}-{sufixo}.parquet"
+            gravar_atomico(os.path.join(pasta_particoes, arquivo), lambda destino: parte.to_parquet(destino, index=False))
+            particoes[str(codigo)] = arquivo
+        
+        removidas = limpar_particoes(pasta_particoes, particoes, manifesto.get("removidas", {}))
+        gravar_json(caminho_manifesto, {
+            "versao": versao_cache, "fontes": fontes, "dimensoes": rotulos, "particoes": particoes,
+            "removidas": removidas,
+        })
+    except (OSError, ValueError, TypeError):
+        particoes = {codigo: arquivo for codigo, arquivo in particoes.items() if int(codigo) not in carregadas}
+    
+    return montar_cubo(nome, pasta_particoes, particoes, dimensoes, carregadas)
+
+def ler_estado_fontes():
+    estado = {}
+    for _, arquivos in fontes_datasets.values():
+        for arquivo in arquivos:
+            try:
+                stat = os.stat(os.path.join(clean_data_path, arquivo))
+            except OSError:
+                estado[arquivo] = None
+            else:
+                estado[arquivo] = [stat.st_mtime_ns, stat.st_size]
+    return estado
+
+def coluna_curso(nome, cubo):
+    if nome != "institucional":
+        return "CURSO"
+    return "LOTACAO" if "LOTACAO" in cubo["dimensoes"] else "SIGLA_LOTACAO"
+
+def resumir_pergunta(indice, pergunta):
+    palavras = pergunta.split()[:6]
+    label_resumido = " ".join(palavras) + "..." if len(palavras) == 6 else pergunta
+    return f"P{indice}: {label_resumido}"
+
+def normalizar_texto(texto):
+    sem_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+    return " ".join(sem_acentos.lower().split())
+
+def construir_indice_busca(nomes):
+    indice_busca = []
+    for nome in nomes:
+        normalizado = normalizar_texto(nome)
+        indice_busca.append((nome, normalizado, tuple(normalizado.split())))
+    return indice_busca
+
+def buscar_nomes(indice_busca, termo, limite):
+    termo = normalizar_texto(termo or "")
+    tokens_termo = termo.split()
+    
+    por_prefixo = []
+    por_palavras = []
+    for nome, normalizado, tokens in indice_busca:
+        if normalizado.startswith(termo):
+            por_prefixo.append(nome)
+            if len(por_prefixo) >= limite:
+                break
+        elif len(por_palavras) < limite and all(
+            any(token.startswith(parte) for token in tokens) for parte in tokens_termo
+        ):
+            por_palavras.append(nome)
+    
+    return (por_prefixo + por_palavras)[:limite]
+
+def opcao_com_busca(nome):
+    return {"label": nome, "value": nome, "search": f"{nome} {normalizar_texto(nome)}"}
+
+def construir_metadados(cubo, coluna_curso, versao):
+    opcoes_perguntas = []
+    mapeamento_perguntas = {}
+    for i, pergunta in enumerate(sorted(cubo["dimensoes"]["PERGUNTA"]), 1):
+        label_final = resumir_pergunta(i, pergunta)
+        opcoes_perguntas.append({"label": label_final, "value": label_final})
+        mapeamento_perguntas[label_final] = pergunta
+    
+    cursos = sorted(cubo["dimensoes"][coluna_curso])
+    
+    return {
+        "versao": versao,
+        "opcoes_ids": [
+            {"label": str(id_pesquisa), "value": int(id_pesquisa)}
+            for id_pesquisa in sorted(cubo["dimensoes"]["ID_PESQUISA"])
+        ],
+        "opcoes_cursos": [{"label": c, "value": c} for c in cursos],
+        "busca_cursos": construir_indice_busca(cursos),
+        "opcoes_perguntas": opcoes_perguntas,
+        "mapeamento_perguntas": mapeamento_perguntas,
+        "valores_filtros": [
+            {int(id_pesquisa) for id_pesquisa in cubo["dimensoes"]["ID_PESQUISA"]},
+            set(cursos),
+            set(mapeamento_perguntas),
+        ],
+    }
+
+def construir_dados(anterior=None):
+    estado_fontes = ler_estado_fontes()
+    assinaturas = {}
+    cubos = {nome: carregar_dataset(nome, assinaturas, anterior) for nome in fontes_datasets}
+    versao = hashlib.sha256(
+        json.dumps([versao_cache, assinaturas], sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+    colunas_curso = {nome: coluna_curso(nome, cubo) for nome, cubo in cubos.items()}
+    
+    return {
+        "versao": versao,
+        "estado_fontes": estado_fontes,
+        "assinaturas": assinaturas,
+        "cubos": cubos,
+        "colunas_curso": colunas_curso,
+        "metadados": {nome: construir_metadados(cubo, colunas_curso[nome], versao) for nome, cubo in cubos.items()},
+    }
+
+dados_atuais = construir_dados()
 
 logging.getLogger('werkzeug').disabled = True
 logging.getLogger('dash').disabled = True
@@ -97,9 +803,98 @@ class DevNull:
 
 sys.stderr = DevNull()
 
+registro = logging.getLogger(__name__)
+saida_registro = logging.StreamHandler(sys.__stderr__)
+saida_registro.setFormatter(logging.Formatter("%(asctime)s [%(process)d] %(levelname)s %(message)s"))
+registro.addHandler(saida_registro)
+registro.setLevel(logging.INFO)
+registro.propagate = False
+
 app = Dash(__name__, suppress_callback_exceptions=True)
 server = app.server 
 
+@server.route("/metrics")
+def metricas_prometheus():
+    return exportar_metricas(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@server.route("/perfis")
+def listar_perfis():
+    if not perfil_solicitado():
+        return "", 404
+    with lock_perfis:
+        return json.dumps(list(perfis_recentes), default=str, ensure_ascii=False), 200, {"Content-Type": "application/json"}
+
+with open(__file__, "rb") as f:
+    versao_codigo = hashlib.sha256(f.read()).hexdigest()[:16]
+
+arquivos_comprimidos = OrderedDict()
+lock_comprimidos = threading.Lock()
+
+def etag_requisicao():
+    if request.method not in ("GET", "HEAD") or not request.path.startswith(rotas_condicionais):
+        return None
+    chave = hashlib.sha256()
+    for parte in (versao_codigo, dados_atuais["versao"], request.full_path):
+        chave.update(parte.encode("utf-8") + b"\0")
+    return chave.hexdigest()[:32]
+
+@server.before_request
+def responder_sem_modificacao():
+    g.etag = etag_requisicao()
+    if g.etag is not None and request.if_none_match.contains_weak(g.etag):
+        resposta = server.response_class(status=304)
+        resposta.set_etag(g.etag, weak=True)
+        resposta.headers["Cache-Control"] = "no-cache"
+        return resposta
+
+def comprimir(corpo, codificacao):
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=qualidade_brotli)
+    return gzip.compress(corpo, compresslevel=nivel_gzip)
+
+@server.after_request
+def comprimir_resposta(resposta):
+    if getattr(g, "etag", None) is not None and resposta.status_code == 200:
+        resposta.set_etag(g.etag, weak=True)
+        resposta.headers["Cache-Control"] = "no-cache"
+    
+    if (
+        compressao_minima <= 0
+        or resposta.status_code != 200
+        or resposta.direct_passthrough
+        or "Content-Encoding" in resposta.headers
+        or resposta.mimetype not in tipos_comprimiveis
+    ):
+        return resposta
+    
+    if brotli is not None and request.accept_encodings["br"]:
+        codificacao = "br"
+    elif request.accept_encodings["gzip"]:
+        codificacao = "gzip"
+    else:
+        return resposta
+    
+    corpo = resposta.get_data()
+    if len(corpo) < compressao_minima:
+        return resposta
+    
+    estatico = request.path.startswith("/_dash-component-suites/")
+    chave = (request.path, codificacao, resposta.get_etag()[0]) if estatico else None
+    with lock_comprimidos:
+        comprimido = arquivos_comprimidos.get(chave) if estatico else None
+    if comprimido is None:
+        comprimido = comprimir(corpo, codificacao)
+        if estatico:
+            with lock_comprimidos:
+                arquivos_comprimidos[chave] = comprimido
+                while len(arquivos_comprimidos) > 64:
+                    arquivos_comprimidos.popitem(last=False)
+    
+    resposta.set_data(comprimido)
+    resposta.headers["Content-Encoding"] = codificacao
+    resposta.vary.add("Accept-Encoding")
+    return resposta
+
 cores_ufpr = {
     'verde_principal': '#008450',
     'verde_secundario': '#4CAF50',
@@ -228,6 +1023,226 @@ estilos = {
     }
 }
 
+cores_respostas = {
+    "Concordo": cores_ufpr['verde_principal'],
+    "Desconheço": cores_ufpr['amarelo'],
+    "Discordo": cores_ufpr['vermelho']
+}
+
+escala_treemap = [
+    [i / (len(px.colors.diverging.RdYlGn) - 1), cor]
+    for i, cor in enumerate(px.colors.diverging.RdYlGn)
+]
+
+template_figuras = json.loads(to_json_plotly(pio.templates[pio.templates.default]))
+
+def estatisticas_por_grupo(dff, coluna):
+    pontuadas = dff["Quantidade"].where(dff["valor_num"].notna(), 0)
+    grupos = pd.DataFrame({
+        coluna: dff[coluna],
+        "soma_valores": dff["valor_num"].fillna(0) * pontuadas,
+        "pontuadas": pontuadas,
+        "Total_Respostas": dff["Quantidade"].where(dff["RESPOSTA"].notna(), 0),
+    }).groupby(coluna, observed=True).sum()
+    
+    grupos["valor_num"] = grupos["soma_valores"] / grupos["pontuadas"]
+    return categorias_para_texto(grupos[["valor_num", "Total_Respostas"]].reset_index())
+
+def anotacoes_totais(totais, tamanho_fonte):
+    textos = "n=" + totais.astype(str)
+    fonte = dict(size=tamanho_fonte, color=cores_ufpr['cinza_escuro'])
+    return [
+        dict(x=105, y=categoria, text=texto, showarrow=False, xanchor="left", font=fonte)
+        for categoria, texto in zip(totais.index, textos)
+    ]
+
+def rotulos_treemap(nomes, totais, tamanho):
+    return nomes.astype(str).str[:tamanho] + "...<br>(" + totais.astype(str) + " resp)"
+
+tipos_plotly = {
+    "int8": "i1", "uint8": "u1", "int16": "i2", "uint16": "u2",
+    "int32": "i4", "uint32": "u4", "float32": "f4", "float64": "f8",
+}
+
+def array_compacto(valores):
+    valores = np.asarray(valores)
+    if not arrays_binarios or valores.dtype.kind not in "iuf" or valores.size < tamanho_minimo_binario:
+        return valores.tolist()
+    
+    if valores.dtype.kind == "f" and np.isfinite(valores).all():
+        if (valores == np.round(valores)).all() and np.abs(valores).max() < 2 ** 31:
+            valores = valores.astype(np.int64)
+        elif (valores == np.round(valores, 2)).all():
+            return valores.tolist()
+    
+    if valores.dtype.kind in "iu":
+        valores = valores.astype(np.result_type(np.min_scalar_type(valores.min()), np.min_scalar_type(valores.max())))
+    if valores.dtype.name not in tipos_plotly:
+        return valores.tolist()
+    
+    compacto = {"dtype": tipos_plotly[valores.dtype.name], "bdata": base64.b64encode(np.ascontiguousarray(valores)).decode("ascii")}
+    if valores.ndim > 1:
+        compacto["shape"] = ", ".join(str(tamanho) for tamanho in valores.shape)
+    return compacto
+
+def compactar_valores(valor):
+    if isinstance(valor, dict):
+        return {chave: compactar_valores(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [compactar_valores(item) for item in valor]
+    if isinstance(valor, (np.ndarray, pd.Series, pd.Index)):
+        return array_compacto(valor)
+    return valor
+
+def montar_figura(dados, layout):
+    layout = dict(layout, template=template_figuras)
+    if validar_figuras:
+        return go.Figure(data=dados, layout=layout)
+    return {"data": compactar_valores(dados), "layout": layout}
+
+def serializar_figura(figura):
+    if orjson is not None:
+        try:
+            return orjson.dumps(figura, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return to_json_plotly(figura)
+
+def serializar_figuras(figuras):
+    return "\n".join(serializar_figura(figura) for figura in figuras)
+
+def ler_figuras(serializado):
+    ler = orjson.loads if orjson is not None else json.loads
+    return [ler(parte) for parte in serializado.split("\n")]
+
+def tracos_barras_empilhadas(dados, coluna, rotulo):
+    tracos = []
+    for resposta in dados["RESPOSTA"].dropna().unique():
+        linhas = dados[dados["RESPOSTA"] == resposta]
+        tracos.append({
+            "type": "bar",
+            "orientation": "h",
+            "name": resposta,
+            "legendgroup": resposta,
+            "showlegend": True,
+            "x": linhas["Percentual"].to_numpy(),
+            "y": linhas[coluna].to_numpy(),
+            "customdata": linhas[["Quantidade"]].to_numpy(),
+            "hovertemplate": (
+                f"Resposta={resposta}<br>Percentual de Respostas (%)=%{{x}}<br>{rotulo}=%{{y}}"
+                "<br>Quantidade=%{customdata[0]}<extra></extra>"
+            ),
+            "marker": {"color": cores_respostas.get(resposta), "pattern": {"shape": ""}},
+            "textposition": "auto",
+            "xaxis": "x",
+            "yaxis": "y",
+        })
+    return tracos
+
+def layout_barras_empilhadas(titulo, rotulo, ordenar_por_total=True, margem_esquerda=150, altura=500):
+    eixo_y = {"anchor": "x", "domain": [0.0, 1.0], "title": {"text": rotulo}}
+    if ordenar_por_total:
+        eixo_y.update(title={}, categoryorder="total ascending", gridcolor=cores_ufpr['cinza_medio'])
+    
+    return {
+        "xaxis": {
+            "anchor": "y",
+            "domain": [0.0, 1.0],
+            "title": {"text": "Percentual de Respostas (%)"},
+            "ticksuffix": "%",
+            "range": [0, 100],
+            "gridcolor": cores_ufpr['cinza_medio'],
+        },
+        "yaxis": eixo_y,
+        "legend": {
+            "title": {"text": "Respostas:"},
+            "tracegroupgap": 0,
+            "orientation": "h",
+            "yanchor": "bottom",
+            "y": 1.02,
+            "xanchor": "right",
+            "x": 1,
+            "bgcolor": 'rgba(255,255,255,0.8)',
+        },
+        "title": {"text": titulo, "x": 0.5, "xanchor": "center", "font": {"color": cores_ufpr['cinza_escuro']}},
+        "barmode": "stack",
+        "margin": {"l": margem_esquerda, "r": 50, "t": 80, "b": 50},
+        "height": altura,
+        "paper_bgcolor": 'white',
+        "plot_bgcolor": 'white',
+    }
+
+def figura_pizza(distribuicao, titulo):
+    dados = [{
+        "type": "pie",
+        "domain": {"x": [0.0, 1.0], "y": [0.0, 1.0]},
+        "labels": distribuicao.index.to_numpy(),
+        "values": distribuicao.to_numpy(),
+        "legendgroup": "",
+        "name": "",
+        "showlegend": True,
+        "textinfo": 'percent+label',
+        "hovertemplate": '<b>%{label}</b><br>Percentual: %{percent}<extra></extra>',
+        "marker": {"line": {"color": 'white', "width": 2}},
+    }]
+    layout = {
+        "legend": {"tracegroupgap": 0, "bgcolor": 'rgba(255,255,255,0.8)'},
+        "title": {"text": titulo, "x": 0.5, "xanchor": "center", "font": {"color": cores_ufpr['cinza_escuro']}},
+        "height": 400,
+        "paper_bgcolor": 'white',
+        "plot_bgcolor": 'white',
+    }
+    return montar_figura(dados, layout)
+
+def figura_treemap(stats, titulo, tamanho_texto, texttemplate=None):
+    totais = stats["Total_Respostas"].astype(float)
+    agrupado = (
+        pd.DataFrame({
+            "rotulo": stats["label_completo"].to_numpy(),
+            "total": totais.to_numpy(),
+            "ponderado": (stats["valor_num"].astype(float) * totais).to_numpy(),
+        })
+        .groupby("rotulo", sort=False)
+        .sum()
+    )
+    rotulos = agrupado.index.to_numpy()
+    medias = (agrupado["ponderado"] / agrupado["total"]).to_numpy()
+    
+    traco = {
+        "type": "treemap",
+        "branchvalues": "total",
+        "domain": {"x": [0.0, 1.0], "y": [0.0, 1.0]},
+        "ids": rotulos,
+        "labels": rotulos,
+        "parents": [""] * len(rotulos),
+        "values": agrupado["total"].to_numpy(),
+        "customdata": medias.reshape(-1, 1),
+        "marker": {"coloraxis": "coloraxis", "colors": medias},
+        "name": "",
+        "textfont": {"size": tamanho_texto, "family": "Segoe UI"},
+        "hovertemplate": '<b>%{label}</b><br>Total Respostas: %{value}<br>Pontuação Média: %{color:.2f}<extra></extra>',
+    }
+    if texttemplate:
+        traco["texttemplate"] = texttemplate
+    
+    layout = {
+        "coloraxis": {
+            "colorbar": {"title": {"text": "valor_num"}},
+            "colorscale": escala_treemap,
+            "cmin": 1,
+            "cmax": 3,
+            "showscale": False,
+        },
+        "legend": {"tracegroupgap": 0},
+        "title": {"text": titulo, "x": 0.5, "xanchor": "center", "font": {"color": cores_ufpr['cinza_escuro']}},
+        "height": 600,
+        "font": {"size": 14, "family": "Segoe UI"},
+        "margin": {"t": 50, "l": 25, "r": 25, "b": 25},
+        "paper_bgcolor": 'white',
+    }
+    return montar_figura([traco], layout)
+
+@medir_etapa("figura")
 def criar_grafico_likert(dff, perguntas_selecionadas=None, mapeamento_perguntas=None):
     if perguntas_selecionadas and mapeamento_perguntas:
         perguntas_completas = [mapeamento_perguntas[p] for p in perguntas_selecionadas]
@@ -241,10 +1256,10 @@ def criar_grafico_likert(dff, perguntas_selecionadas=None, mapeamento_perguntas=
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    likert_df = (
-        dff.groupby(["PERGUNTA", "RESPOSTA"])
-           .size()
-           .reset_index(name="Quantidade")
+    likert_df = categorias_para_texto(
+        dff.groupby(["PERGUNTA", "RESPOSTA"], observed=True)["Quantidade"]
+           .sum()
+           .reset_index()
     )
     
     total_por_pergunta = likert_df.groupby("PERGUNTA")["Quantidade"].transform('sum')
@@ -265,61 +1280,18 @@ def criar_grafico_likert(dff, perguntas_selecionadas=None, mapeamento_perguntas=
     likert_df["ordem_concordo"] = likert_df["PERGUNTA"].map(taxa_concordo).fillna(0)
     likert_df.sort_values(["ordem_concordo", "PERGUNTA", "RESPOSTA"], ascending=[False, True, True], inplace=True)
 
-    fig = px.bar(
-        likert_df,
-        x="Percentual",
-        y="PERGUNTA",
-        color="RESPOSTA",
-        barmode="stack",
-        title="Distribuição de Respostas por Pergunta",
-        labels={
-            "PERGUNTA": "Pergunta", 
-            "Percentual": "Percentual de Respostas (%)", 
-            "RESPOSTA": "Resposta"
-        },
-        color_discrete_map={
-            "Concordo": cores_ufpr['verde_principal'],
-            "Desconheço": cores_ufpr['amarelo'],
-            "Discordo": cores_ufpr['vermelho']
-        },
-        hover_data={"Quantidade": True, "Percentual": True}
-    )
+    layout = layout_barras_empilhadas("Distribuição de Respostas por Pergunta", "Pergunta")
+    layout["title"]["font"] = dict(size=18, family="Arial", color=cores_ufpr['cinza_escuro'])
+    layout["font"] = dict(size=12, family="Segoe UI")
     
-    fig.update_layout(
-        margin=dict(l=150, r=50, t=80, b=50),
-        legend=dict(
-            title="Respostas:",
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255,255,255,0.8)'
-        ),
-        title=dict(
-            text="Distribuição de Respostas por Pergunta",
-            x=0.5,
-            xanchor="center",
-            font=dict(size=18, family="Arial", color=cores_ufpr['cinza_escuro'])
-        ),
-        font=dict(size=12, family="Segoe UI"),
-        height=500,
-        paper_bgcolor='white',
-        plot_bgcolor='white'
-    )
+    totais = likert_df.groupby("PERGUNTA")["Quantidade"].sum()
+    layout["annotations"] = anotacoes_totais(totais, tamanho_fonte=10)
     
-    fig.update_xaxes(ticksuffix="%", range=[0, 100], gridcolor=cores_ufpr['cinza_medio'])
-    fig.update_yaxes(title=None, categoryorder="total ascending", gridcolor=cores_ufpr['cinza_medio'])
-    
-    totais = likert_df.groupby("PERGUNTA")["Quantidade"].sum().reset_index()
-    for idx, row in totais.iterrows():
-        fig.add_annotation(
-            x=105, y=row["PERGUNTA"], text=f"n={row['Quantidade']}",
-            showarrow=False, xanchor="left", font=dict(size=10, color=cores_ufpr['cinza_escuro'])
-        )
+    fig = montar_figura(tracos_barras_empilhadas(likert_df, "PERGUNTA", "Pergunta"), layout)
 
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_satisfacao_geral(dff):
     if dff.empty:
         fig = go.Figure()
@@ -329,38 +1301,14 @@ def criar_grafico_satisfacao_geral(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
-    distribuição_respostas = dff["RESPOSTA"].value_counts(normalize=True) * 100
-    
-    fig = px.pie(
-        values=distribuição_respostas.values,
-        names=distribuição_respostas.index,
-        title="Distribuição Geral de Respostas",
-        color_discrete_map={
-            "Concordo": cores_ufpr['verde_principal'],
-            "Desconheço": cores_ufpr['amarelo'],
-            "Discordo": cores_ufpr['vermelho']
-        }
-    )
+    contagem_respostas = dff.groupby("RESPOSTA", observed=True)["Quantidade"].sum().sort_values(ascending=False)
+    distribuição_respostas = contagem_respostas / contagem_respostas.sum() * 100
     
-    fig.update_layout(
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=400,
-        paper_bgcolor='white',
-        plot_bgcolor='white',
-        legend=dict(bgcolor='rgba(255,255,255,0.8)')
-    )
-    
-    fig.update_traces(
-        textinfo='percent+label',
-        hovertemplate='<b>%{label}</b><br>Percentual: %{percent}<extra></extra>',
-        marker=dict(line=dict(color='white', width=2))
-    )
+    fig = figura_pizza(distribuição_respostas, "Distribuição Geral de Respostas")
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_top_cursos(dff):
     if dff.empty:
         fig = go.Figure()
@@ -370,10 +1318,7 @@ def criar_grafico_top_cursos(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
-    media_curso = dff.groupby("CURSO")["valor_num"].mean().reset_index()
+    media_curso = estatisticas_por_grupo(dff, "CURSO")[["CURSO", "valor_num"]]
     media_curso = media_curso.nlargest(15, "valor_num")
     
     max_pontuacao = media_curso["valor_num"].max()
@@ -402,6 +1347,7 @@ def criar_grafico_top_cursos(dff):
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_treemap_setor(dff):
     if dff.empty:
         fig = go.Figure()
@@ -411,14 +1357,7 @@ def criar_grafico_treemap_setor(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
-    setor_stats = dff.groupby("SETOR_CURSO").agg({
-        "valor_num": "mean",
-        "RESPOSTA": "count"
-    }).reset_index()
-    setor_stats.rename(columns={"RESPOSTA": "Total_Respostas"}, inplace=True)
+    setor_stats = estatisticas_por_grupo(dff, "SETOR_CURSO")
     
     setor_stats = setor_stats.nlargest(10, "Total_Respostas")
     
@@ -435,37 +1374,13 @@ def criar_grafico_treemap_setor(dff):
         
         setor_stats = pd.concat([top_10, outros_row], ignore_index=True)
     
-    setor_stats['label_completo'] = setor_stats.apply(
-        lambda x: f"{x['SETOR_CURSO'][:25]}...<br>({x['Total_Respostas']} resp)", 
-        axis=1
-    )
-    
-    fig = px.treemap(
-        setor_stats,
-        path=["label_completo"],
-        values="Total_Respostas",
-        color="valor_num",
-        color_continuous_scale="RdYlGn",
-        title="Top 10 Setores por Volume de Respostas",
-        range_color=[1, 3]
-    )
-    
-    fig.update_layout(
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=600,
-        font=dict(size=14, family="Segoe UI"),
-        margin=dict(t=50, l=25, r=25, b=25),
-        paper_bgcolor='white'
-    )
+    setor_stats['label_completo'] = rotulos_treemap(setor_stats['SETOR_CURSO'], setor_stats["Total_Respostas"], 25)
     
-    fig.update_coloraxes(showscale=False)
-    fig.update_traces(
-        textfont=dict(size=16, family="Segoe UI"),
-        hovertemplate='<b>%{label}</b><br>Total Respostas: %{value}<br>Pontuação Média: %{color:.2f}<extra></extra>'
-    )
+    fig = figura_treemap(setor_stats, "Top 10 Setores por Volume de Respostas", tamanho_texto=16)
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_treemap_departamento(dff):
     if dff.empty:
         fig = go.Figure()
@@ -475,14 +1390,7 @@ def criar_grafico_treemap_departamento(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
-    depto_stats = dff.groupby("DEPARTAMENTO").agg({
-        "valor_num": "mean",
-        "RESPOSTA": "count"
-    }).reset_index()
-    depto_stats.rename(columns={"RESPOSTA": "Total_Respostas"}, inplace=True)
+    depto_stats = estatisticas_por_grupo(dff, "DEPARTAMENTO")
     
     depto_stats = depto_stats.nlargest(10, "Total_Respostas")
     
@@ -499,37 +1407,13 @@ def criar_grafico_treemap_departamento(dff):
         
         depto_stats = pd.concat([top_10, outros_row], ignore_index=True)
     
-    depto_stats['label_completo'] = depto_stats.apply(
-        lambda x: f"{x['DEPARTAMENTO'][:25]}...<br>({x['Total_Respostas']} resp)", 
-        axis=1
-    )
-    
-    fig = px.treemap(
-        depto_stats,
-        path=["label_completo"],
-        values="Total_Respostas",
-        color="valor_num",
-        color_continuous_scale="RdYlGn",
-        title="Top 10 Departamentos por Volume de Respostas",
-        range_color=[1, 3]
-    )
-    
-    fig.update_layout(
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=600,
-        font=dict(size=14, family="Segoe UI"),
-        margin=dict(t=50, l=25, r=25, b=25),
-        paper_bgcolor='white'
-    )
+    depto_stats['label_completo'] = rotulos_treemap(depto_stats['DEPARTAMENTO'], depto_stats["Total_Respostas"], 25)
     
-    fig.update_coloraxes(showscale=False)
-    fig.update_traces(
-        textfont=dict(size=16, family="Segoe UI"),
-        hovertemplate='<b>%{label}</b><br>Total Respostas: %{value}<br>Pontuação Média: %{color:.2f}<extra></extra>'
-    )
+    fig = figura_treemap(depto_stats, "Top 10 Departamentos por Volume de Respostas", tamanho_texto=16)
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_distribuicao_cursos(dff):
     if dff.empty:
         fig = go.Figure()
@@ -539,7 +1423,7 @@ def criar_grafico_distribuicao_cursos(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    curso_respostas = dff.groupby(["CURSO", "RESPOSTA"]).size().reset_index(name="Quantidade")
+    curso_respostas = categorias_para_texto(dff.groupby(["CURSO", "RESPOSTA"], observed=True)["Quantidade"].sum().reset_index())
     
     totais_curso = curso_respostas.groupby("CURSO")["Quantidade"].sum().reset_index()
     totais_curso = totais_curso.nlargest(15, "Quantidade")
@@ -565,55 +1449,16 @@ def criar_grafico_distribuicao_cursos(dff):
     curso_respostas.sort_values(["ordem_concordo", "CURSO", "RESPOSTA"], 
                                ascending=[False, True, True], inplace=True)
 
-    fig = px.bar(
-        curso_respostas,
-        x="Percentual",
-        y="CURSO",
-        color="RESPOSTA",
-        barmode="stack",
-        title="Distribuição de Respostas por Cursos (Top 15)",
-        labels={
-            "CURSO": "Curso", 
-            "Percentual": "Percentual de Respostas (%)", 
-            "RESPOSTA": "Resposta"
-        },
-        color_discrete_map={
-            "Concordo": cores_ufpr['verde_principal'],
-            "Desconheço": cores_ufpr['amarelo'],
-            "Discordo": cores_ufpr['vermelho']
-        },
-        hover_data={"Quantidade": True, "Percentual": True}
-    )
+    layout = layout_barras_empilhadas("Distribuição de Respostas por Cursos (Top 15)", "Curso")
     
-    fig.update_layout(
-        margin=dict(l=150, r=50, t=80, b=50),
-        legend=dict(
-            title="Respostas:",
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255,255,255,0.8)'
-        ),
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=500,
-        paper_bgcolor='white',
-        plot_bgcolor='white'
-    )
-    
-    fig.update_xaxes(ticksuffix="%", range=[0, 100], gridcolor=cores_ufpr['cinza_medio'])
-    fig.update_yaxes(title=None, categoryorder="total ascending", gridcolor=cores_ufpr['cinza_medio'])
+    totais = curso_respostas.groupby("CURSO")["Quantidade"].sum()
+    layout["annotations"] = anotacoes_totais(totais, tamanho_fonte=10)
     
-    totais = curso_respostas.groupby("CURSO")["Quantidade"].sum().reset_index()
-    for idx, row in totais.iterrows():
-        fig.add_annotation(
-            x=105, y=row["CURSO"], text=f"n={row['Quantidade']}",
-            showarrow=False, xanchor="left", font=dict(size=10, color=cores_ufpr['cinza_escuro'])
-        )
+    fig = montar_figura(tracos_barras_empilhadas(curso_respostas, "CURSO", "Curso"), layout)
 
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_distribuicao_disciplinas_ead(dff):
     if dff.empty:
         fig = go.Figure()
@@ -628,7 +1473,7 @@ def criar_grafico_distribuicao_disciplinas_ead(dff):
     else:
         coluna_disciplina = "COD_DISCIPLINA" 
     
-    disciplina_respostas = dff.groupby([coluna_disciplina, "RESPOSTA"]).size().reset_index(name="Quantidade")
+    disciplina_respostas = categorias_para_texto(dff.groupby([coluna_disciplina, "RESPOSTA"], observed=True)["Quantidade"].sum().reset_index())
     
     totais_disciplina = disciplina_respostas.groupby(coluna_disciplina)["Quantidade"].sum().reset_index()
     totais_disciplina = totais_disciplina.nlargest(15, "Quantidade")
@@ -654,56 +1499,19 @@ def criar_grafico_distribuicao_disciplinas_ead(dff):
     disciplina_respostas.sort_values(["ordem_concordo", coluna_disciplina, "RESPOSTA"], 
                                     ascending=[False, True, True], inplace=True)
 
-    fig = px.bar(
-        disciplina_respostas,
-        x="Percentual",
-        y=coluna_disciplina,
-        color="RESPOSTA",
-        barmode="stack",
-        title="Distribuição de Respostas por Disciplinas EAD (Top 15)",
-        labels={
-            coluna_disciplina: "Disciplina", 
-            "Percentual": "Percentual de Respostas (%)", 
-            "RESPOSTA": "Resposta"
-        },
-        color_discrete_map={
-            "Concordo": cores_ufpr['verde_principal'],
-            "Desconheço": cores_ufpr['amarelo'],
-            "Discordo": cores_ufpr['vermelho']
-        },
-        hover_data={"Quantidade": True, "Percentual": True}
-    )
-    
-    fig.update_layout(
-        margin=dict(l=200, r=50, t=80, b=50),
-        legend=dict(
-            title="Respostas:",
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255,255,255,0.8)'
-        ),
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=600,
-        font=dict(size=11, family="Segoe UI"),
-        paper_bgcolor='white',
-        plot_bgcolor='white'
+    layout = layout_barras_empilhadas(
+        "Distribuição de Respostas por Disciplinas EAD (Top 15)", "Disciplina", margem_esquerda=200, altura=600
     )
+    layout["font"] = dict(size=11, family="Segoe UI")
     
-    fig.update_xaxes(ticksuffix="%", range=[0, 100], gridcolor=cores_ufpr['cinza_medio'])
-    fig.update_yaxes(title=None, categoryorder="total ascending", gridcolor=cores_ufpr['cinza_medio'])
+    totais = disciplina_respostas.groupby(coluna_disciplina)["Quantidade"].sum()
+    layout["annotations"] = anotacoes_totais(totais, tamanho_fonte=9)
     
-    totais = disciplina_respostas.groupby(coluna_disciplina)["Quantidade"].sum().reset_index()
-    for idx, row in totais.iterrows():
-        fig.add_annotation(
-            x=105, y=row[coluna_disciplina], text=f"n={row['Quantidade']}",
-            showarrow=False, xanchor="left", font=dict(size=9, color=cores_ufpr['cinza_escuro'])
-        )
+    fig = montar_figura(tracos_barras_empilhadas(disciplina_respostas, coluna_disciplina, "Disciplina"), layout)
 
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_treemap_disciplinas_ead(dff):
     if dff.empty:
         fig = go.Figure()
@@ -713,19 +1521,12 @@ def criar_grafico_treemap_disciplinas_ead(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
     if "NOME_DISCIPLINA" in dff.columns and not dff["NOME_DISCIPLINA"].isna().all():
         coluna_disciplina = "NOME_DISCIPLINA"
     else:
         coluna_disciplina = "COD_DISCIPLINA"
     
-    disciplina_stats = dff.groupby(coluna_disciplina).agg({
-        "valor_num": "mean",
-        "RESPOSTA": "count"
-    }).reset_index()
-    disciplina_stats.rename(columns={"RESPOSTA": "Total_Respostas"}, inplace=True)
+    disciplina_stats = estatisticas_por_grupo(dff, coluna_disciplina)
     
     disciplina_stats = disciplina_stats.nlargest(10, "Total_Respostas")
     
@@ -742,38 +1543,13 @@ def criar_grafico_treemap_disciplinas_ead(dff):
         
         disciplina_stats = pd.concat([top_10, outros_row], ignore_index=True)
     
-    disciplina_stats['label_completo'] = disciplina_stats.apply(
-        lambda x: f"{x[coluna_disciplina][:30]}...<br>({x['Total_Respostas']} resp)", 
-        axis=1
-    )
-    
-    fig = px.treemap(
-        disciplina_stats,
-        path=["label_completo"],
-        values="Total_Respostas",
-        color="valor_num",
-        color_continuous_scale="RdYlGn",
-        title="Top 10 Disciplinas EAD por Volume de Respostas",
-        range_color=[1, 3]
-    )
-    
-    fig.update_layout(
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=600,
-        font=dict(size=14, family="Segoe UI"),
-        margin=dict(t=50, l=25, r=25, b=25),
-        paper_bgcolor='white'
-    )
+    disciplina_stats['label_completo'] = rotulos_treemap(disciplina_stats[coluna_disciplina], disciplina_stats["Total_Respostas"], 30)
     
-    fig.update_traces(
-        textfont=dict(size=14, family="Segoe UI"),
-        texttemplate='<b>%{label}</b>',
-        hovertemplate='<b>%{label}</b><br>Total Respostas: %{value}<br>Pontuação Média: %{color:.2f}<extra></extra>'
-    )
-    fig.update_coloraxes(showscale=False)
+    fig = figura_treemap(disciplina_stats, "Top 10 Disciplinas EAD por Volume de Respostas", tamanho_texto=14, texttemplate='<b>%{label}</b>')
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_distribuicao_unidades_institucional(dff):
     if dff.empty:
         fig = go.Figure()
@@ -783,15 +1559,12 @@ def criar_grafico_distribuicao_unidades_institucional(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
     if "LOTACAO" in dff.columns and not dff["LOTACAO"].isna().all():
         coluna_unidade = "LOTACAO"
     else:
         coluna_unidade = "SIGLA_LOTACAO"
     
-    unidade_respostas = dff.groupby([coluna_unidade, "RESPOSTA"]).size().reset_index(name="Quantidade")
+    unidade_respostas = categorias_para_texto(dff.groupby([coluna_unidade, "RESPOSTA"], observed=True)["Quantidade"].sum().reset_index())
     
     totais_unidade = unidade_respostas.groupby(coluna_unidade)["Quantidade"].sum().reset_index()
     totais_unidade = totais_unidade.nlargest(10, "Quantidade")
@@ -807,47 +1580,12 @@ def criar_grafico_distribuicao_unidades_institucional(dff):
         ordered=True
     )
     
-    fig = px.bar(
-        unidade_respostas,
-        x="Percentual",
-        y=coluna_unidade,
-        color="RESPOSTA",
-        barmode="stack",
-        title="Distribuição de Respostas por Unidade (Top 10)",
-        labels={
-            coluna_unidade: "Unidade", 
-            "Percentual": "Percentual de Respostas (%)", 
-            "RESPOSTA": "Resposta"
-        },
-        color_discrete_map={
-            "Concordo": cores_ufpr['verde_principal'],
-            "Desconheço": cores_ufpr['amarelo'],
-            "Discordo": cores_ufpr['vermelho']
-        },
-        hover_data={"Quantidade": True, "Percentual": True}
-    )
-    
-    fig.update_layout(
-        margin=dict(l=150, r=50, t=80, b=50),
-        legend=dict(
-            title="Respostas:",
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1,
-            bgcolor='rgba(255,255,255,0.8)'
-        ),
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=500,
-        paper_bgcolor='white',
-        plot_bgcolor='white'
-    )
-    
-    fig.update_xaxes(ticksuffix="%", range=[0, 100], gridcolor=cores_ufpr['cinza_medio'])
+    layout = layout_barras_empilhadas("Distribuição de Respostas por Unidade (Top 10)", "Unidade", ordenar_por_total=False)
+    fig = montar_figura(tracos_barras_empilhadas(unidade_respostas, coluna_unidade, "Unidade"), layout)
     
     return fig
 
+@medir_etapa("figura")
 def criar_grafico_treemap_unidades_institucional(dff):
     if dff.empty:
         fig = go.Figure()
@@ -857,19 +1595,12 @@ def criar_grafico_treemap_unidades_institucional(dff):
         fig.update_layout(paper_bgcolor='white', plot_bgcolor='white')
         return fig
     
-    valores = {"Discordo": 1, "Desconheço": 2, "Concordo": 3}
-    dff["valor_num"] = dff["RESPOSTA"].map(valores)
-    
     if "LOTACAO" in dff.columns and not dff["LOTACAO"].isna().all():
         coluna_unidade = "LOTACAO"
     else:
         coluna_unidade = "SIGLA_LOTACAO"
     
-    unidade_stats = dff.groupby(coluna_unidade).agg({
-        "valor_num": "mean",
-        "RESPOSTA": "count"
-    }).reset_index()
-    unidade_stats.rename(columns={"RESPOSTA": "Total_Respostas"}, inplace=True)
+    unidade_stats = estatisticas_por_grupo(dff, coluna_unidade)
     
     unidade_stats = unidade_stats.nlargest(10, "Total_Respostas")
     
@@ -886,256 +1617,641 @@ def criar_grafico_treemap_unidades_institucional(dff):
         
         unidade_stats = pd.concat([top_10, outros_row], ignore_index=True)
     
-    unidade_stats['label_completo'] = unidade_stats.apply(
-        lambda x: f"{x[coluna_unidade][:25]}...<br>({x['Total_Respostas']} resp)", 
-        axis=1
-    )
+    unidade_stats['label_completo'] = rotulos_treemap(unidade_stats[coluna_unidade], unidade_stats["Total_Respostas"], 25)
     
-    fig = px.treemap(
-        unidade_stats,
-        path=["label_completo"],
-        values="Total_Respostas",
-        color="valor_num",
-        color_continuous_scale="RdYlGn",
-        title="Top 10 Unidades por Volume de Respostas",
-        range_color=[1, 3]
-    )
+    fig = figura_treemap(unidade_stats, "Top 10 Unidades por Volume de Respostas", tamanho_texto=16)
     
-    fig.update_layout(
-        title=dict(x=0.5, xanchor="center", font=dict(color=cores_ufpr['cinza_escuro'])),
-        height=600,
-        font=dict(size=14, family="Segoe UI"),
-        margin=dict(t=50, l=25, r=25, b=25),
-        paper_bgcolor='white'
-    )
+    return fig
+
+class CacheFiguras:
+    def __init__(self, tamanho_maximo):
+        self.tamanho_maximo = tamanho_maximo
+        self.itens = OrderedDict()
+        self.versao = None
+        self.lock = threading.Lock()
+    
+    def definir_versao(self, versao):
+        with self.lock:
+            if versao != self.versao:
+                self.itens.clear()
+                self.versao = versao
+    
+    def obter(self, chave):
+        with self.lock:
+            valor = self.itens.get(chave)
+            if valor is not None:
+                self.itens.move_to_end(chave)
+            return valor
+    
+    def guardar(self, chave, valor):
+        if self.tamanho_maximo <= 0:
+            return
+        
+        with self.lock:
+            self.itens[chave] = valor
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.tamanho_maximo:
+                self.itens.popitem(last=False)
+
+class CacheSQLite:
+    def __init__(self, caminho, tamanho_maximo):
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo
+        self.local = threading.local()
+        self.versao = None
+        os.register_at_fork(after_in_child=self.descartar_conexoes)
+        
+        with self.conexao() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute(
+                "CREATE TABLE IF NOT EXISTS figuras "
+                "(chave TEXT PRIMARY KEY, versao TEXT, valor TEXT, criado REAL)"
+            )
+    
+    def conexao(self):
+        if getattr(self.local, "conexao", None) is None:
+            self.local.conexao = sqlite3.connect(self.caminho, timeout=5)
+        return self.local.conexao
+    
+    def descartar_conexoes(self):
+        self.local = threading.local()
+    
+    def definir_versao(self, versao):
+        self.versao = versao
+        try:
+            with self.conexao() as conexao:
+                conexao.execute("DELETE FROM figuras WHERE versao != ?", (versao,))
+        except sqlite3.Error:
+            pass
+    
+    def obter(self, chave):
+        try:
+            linha = self.conexao().execute("SELECT valor FROM figuras WHERE chave = ?", (chave,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return linha[0] if linha else None
+    
+    def guardar(self, chave, valor):
+        try:
+            with self.conexao() as conexao:
+                conexao.execute(
+                    "INSERT OR REPLACE INTO figuras VALUES (?, ?, ?, ?)",
+                    (chave, self.versao, valor, time.time())
+                )
+                conexao.execute(
+                    "DELETE FROM figuras WHERE chave IN "
+                    "(SELECT chave FROM figuras ORDER BY criado DESC LIMIT -1 OFFSET ?)",
+                    (self.tamanho_maximo,)
+                )
+        except sqlite3.Error:
+            pass
+
+class CacheRedis:
+    def __init__(self, cliente, expiracao=None, prefixo="dashboard:figuras:"):
+        self.cliente = cliente
+        self.expiracao = expiracao
+        self.prefixo = prefixo
     
-    fig.update_coloraxes(showscale=False)
-    fig.update_traces(
-        textfont=dict(size=16, family="Segoe UI"),
-        hovertemplate='<b>%{label}</b><br>Total Respostas: %{value}<br>Pontuação Média: %{color:.2f}<extra></extra>'
-    )
+    def definir_versao(self, versao):
+        pass
     
-    return fig
+    def obter(self, chave):
+        try:
+            valor = self.cliente.get(self.prefixo + chave)
+        except Exception:
+            return None
+        
+        if isinstance(valor, bytes):
+            valor = valor.decode("utf-8")
+        return valor
+    
+    def guardar(self, chave, valor):
+        try:
+            self.cliente.set(self.prefixo + chave, valor, ex=self.expiracao)
+        except Exception:
+            pass
 
-componentes_iniciais = {
-    'filtro-id-cursos': dcc.Dropdown(id="filtro-id-cursos", options=[], multi=True),
-    'filtro-curso-cursos': dcc.Dropdown(id="filtro-curso-cursos", options=[], multi=True),
-    'grafico-satisfacao-cursos': dcc.Graph(id="grafico-satisfacao-cursos"),
-    'grafico-distribuicao-cursos': dcc.Graph(id="grafico-distribuicao-cursos"),
-    'grafico-treemap-setores': dcc.Graph(id="grafico-treemap-setores"),
-    
-    'filtro-id-presencial': dcc.Dropdown(id="filtro-id-presencial", options=[], multi=True),
-    'filtro-curso-presencial': dcc.Dropdown(id="filtro-curso-presencial", options=[], multi=True),
-    'filtro-pergunta-presencial': dcc.Dropdown(id="filtro-pergunta-presencial", options=[], multi=True),
-    'grafico-likert-presencial': dcc.Graph(id="grafico-likert-presencial"),
-    'grafico-satisfacao-presencial': dcc.Graph(id="grafico-satisfacao-presencial"),
-    'grafico-treemap-departamentos': dcc.Graph(id="grafico-treemap-departamentos"),
-    
-    'filtro-id-ead': dcc.Dropdown(id="filtro-id-ead", options=[], multi=True),
-    'filtro-programa-ead': dcc.Dropdown(id="filtro-programa-ead", options=[], multi=True),
-    'filtro-pergunta-ead': dcc.Dropdown(id="filtro-pergunta-ead", options=[], multi=True),
-    'grafico-distribuicao-disciplinas-ead': dcc.Graph(id="grafico-distribuicao-disciplinas-ead"),
-    'grafico-satisfacao-ead': dcc.Graph(id="grafico-satisfacao-ead"),
-    'grafico-treemap-disciplinas-ead': dcc.Graph(id="grafico-treemap-disciplinas-ead"),
-    
-    'filtro-id-institucional': dcc.Dropdown(id="filtro-id-institucional", options=[], multi=True),
-    'filtro-unidade-institucional': dcc.Dropdown(id="filtro-unidade-institucional", options=[], multi=True),
-    'grafico-satisfacao-institucional': dcc.Graph(id="grafico-satisfacao-institucional"),
-    'grafico-distribuicao-unidades-institucional': dcc.Graph(id="grafico-distribuicao-unidades-institucional"),
-    'grafico-treemap-unidades-institucional': dcc.Graph(id="grafico-treemap-unidades-institucional"),
-}
+class CacheEmCamadas:
+    def __init__(self, local, compartilhado=None):
+        self.local = local
+        self.compartilhado = compartilhado
+    
+    def definir_versao(self, versao):
+        self.local.definir_versao(versao)
+        if self.compartilhado is not None:
+            self.compartilhado.definir_versao(versao)
+    
+    def obter(self, chave):
+        valor = self.local.obter(chave)
+        if valor is None and self.compartilhado is not None:
+            valor = self.compartilhado.obter(chave)
+            if valor is not None:
+                self.local.guardar(chave, valor)
+        return valor
+    
+    def guardar(self, chave, valor):
+        self.local.guardar(chave, valor)
+        if self.compartilhado is not None:
+            self.compartilhado.guardar(chave, valor)
 
-def criar_layout_cursos():
-    componentes_iniciais['filtro-id-cursos'].options = [
-        {"label": str(id_pesquisa), "value": id_pesquisa} 
-        for id_pesquisa in sorted(df_cursos["ID_PESQUISA"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-curso-cursos'].options = [
-        {"label": c, "value": c} for c in sorted(df_cursos["CURSO"].dropna().unique())
-    ]
+def criar_cache_compartilhado(backend):
+    if backend == "sqlite":
+        os.makedirs(cache_dir, exist_ok=True)
+        return CacheSQLite(os.path.join(cache_dir, "figuras.sqlite"), tamanho_cache_compartilhado)
+    
+    if backend == "redis":
+        import redis
+        
+        cliente = redis.Redis.from_url(os.environ.get("DASHBOARD_REDIS_URL", "redis://localhost:6379/0"))
+        return CacheRedis(cliente, expiracao=expiracao_cache_compartilhado)
+    
+    if backend == "memoria":
+        return None
+    
+    raise ValueError(f"DASHBOARD_CACHE_BACKEND desconhecido: {backend}")
+
+cache_figuras = CacheEmCamadas(
+    CacheFiguras(tamanho_cache_figuras),
+    criar_cache_compartilhado(backend_cache_figuras)
+)
+cache_figuras.definir_versao(dados_atuais["versao"])
+
+lock_recarga = threading.Lock()
+
+def recarregar_dados():
+    global dados_atuais
     
+    with lock_recarga:
+        novos = construir_dados(dados_atuais)
+        cache_figuras.definir_versao(novos["versao"])
+        dados_atuais = novos
+    
+    registro.info("Dados recarregados de %s (versão %s)", clean_data_path, novos["versao"])
+    iniciar_aquecimento(novos)
+    return novos
+
+def monitorar_dados():
+    observado = None
+    tentado = None
+    while True:
+        time.sleep(intervalo_recarga)
+        estado = ler_estado_fontes()
+        if estado == dados_atuais["estado_fontes"] or estado == tentado:
+            observado = None
+            continue
+        
+        if estado != observado:
+            observado = estado
+            continue
+        
+        tentado = estado
+        try:
+            recarregar_dados()
+        except Exception:
+            registro.exception("Falha ao recarregar os dados de %s", clean_data_path)
+
+def iniciar_monitoramento():
+    if intervalo_recarga > 0:
+        threading.Thread(target=monitorar_dados, name="monitor-dados", daemon=True).start()
+
+def normalizar_filtro(valores):
+    return sorted(valores) if valores else []
+
+geradores_figuras = {}
+formato_figuras = 2
+
+def chave_figuras(dataset, versao, filtros):
+    estado = [dataset, versao, formato_figuras] + [normalizar_filtro(valores) for valores in filtros]
+    return hashlib.sha256(json.dumps(estado, default=str).encode("utf-8")).hexdigest()
+
+def gerar_figuras(dataset, dados, filtros, ler_cache=True):
+    gerador = geradores_figuras[dataset]
+    contexto_metricas.callback = gerador.__name__
+    chave = chave_figuras(dataset, dados["versao"], filtros)
+    em_cache = cache_figuras.obter(chave) if ler_cache else None
+    if em_cache is not None:
+        consultas_cache_figuras.incrementar(gerador.__name__, "acerto")
+        tamanho_respostas.observar(len(em_cache.encode("utf-8")), gerador.__name__)
+        return em_cache
+    
+    consultas_cache_figuras.incrementar(gerador.__name__, "falta")
+    figuras = gerador(dados, *filtros)
+    inicio = time.perf_counter()
+    serializado = serializar_figuras(figuras)
+    duracao_etapas.observar(time.perf_counter() - inicio, gerador.__name__, "serializacao", "serializar_figuras")
+    tamanho_respostas.observar(len(serializado.encode("utf-8")), gerador.__name__)
+    cache_figuras.guardar(chave, serializado)
+    return serializado
+
+def responder_figuras(serializado):
+    partes = serializado.split("\n")
+    if not has_request_context():
+        return tuple(ler_figuras(serializado))
+    
+    marcador = os.urandom(8).hex()
+    g.figuras_serializadas = (marcador, partes)
+    return tuple(f"figura-serializada-{marcador}-{indice}" for indice in range(len(partes)))
+
+@server.after_request
+def inserir_figuras_serializadas(resposta):
+    figuras = getattr(g, "figuras_serializadas", None)
+    if figuras is None or resposta.status_code != 200:
+        return resposta
+    
+    marcador, partes = figuras
+    corpo = resposta.get_data(as_text=True)
+    for indice, parte in enumerate(partes):
+        corpo = corpo.replace(f'"figura-serializada-{marcador}-{indice}"', parte, 1)
+    resposta.set_data(corpo)
+    return resposta
+
+class Amostrador:
+    def __init__(self, intervalo):
+        self.intervalo = intervalo
+        self.alvos = {}
+        self.lock = threading.Lock()
+        self.thread = None
+    
+    def iniciar(self, ident):
+        with self.lock:
+            self.alvos[ident] = Counter()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.executar, name="amostrador-perfil", daemon=True)
+                self.thread.start()
+    
+    def parar(self, ident):
+        with self.lock:
+            return self.alvos.pop(ident, Counter())
+    
+    def executar(self):
+        while True:
+            time.sleep(self.intervalo)
+            with self.lock:
+                if not self.alvos:
+                    self.thread = None
+                    return
+                
+                quadros = sys._current_frames()
+                for ident, pilhas in self.alvos.items():
+                    quadro = quadros.get(ident)
+                    pilha = []
+                    while quadro is not None:
+                        codigo = quadro.f_code
+                        pilha.append((codigo.co_filename, codigo.co_firstlineno, codigo.co_name))
+                        quadro = quadro.f_back
+                    if pilha:
+                        pilhas[tuple(pilha)] += 1
+
+amostrador = Amostrador(intervalo_amostragem)
+perfis_recentes = deque(maxlen=50)
+lock_perfis = threading.Lock()
+caminho_perfis = os.path.join(cache_dir, "perfis.jsonl")
+
+def perfil_solicitado():
+    if not token_perfil or not has_request_context():
+        return False
+    enviado = request.headers.get("X-Dashboard-Perfil", "")
+    return hmac.compare_digest(enviado, token_perfil)
+
+def modulo_do_arquivo(arquivo):
+    if arquivo == "~":
+        return "nativo"
+    if os.path.abspath(arquivo) == os.path.abspath(__file__):
+        return "app"
+    partes = arquivo.replace("\\", "/").split("/")
+    if "site-packages" in partes and partes.index("site-packages") + 1 < len(partes):
+        return partes[partes.index("site-packages") + 1].split(".")[0]
+    return "python"
+
+def quadros_cprofile(perfilador):
+    quadros = []
+    for (arquivo, linha, nome), (_, chamadas, proprio, acumulado, _) in pstats.Stats(perfilador).stats.items():
+        quadros.append({
+            "funcao": f"{arquivo}:{linha}({nome})", "modulo": modulo_do_arquivo(arquivo),
+            "chamadas": chamadas, "proprio_ms": proprio * 1000, "acumulado_ms": acumulado * 1000,
+        })
+    return quadros
+
+def quadros_amostras(pilhas, intervalo):
+    proprio, acumulado = Counter(), Counter()
+    for pilha, total in pilhas.items():
+        proprio[pilha[0]] += total
+        for quadro in set(pilha):
+            acumulado[quadro] += total
+    
+    return [{
+        "funcao": f"{arquivo}:{linha}({nome})", "modulo": modulo_do_arquivo(arquivo),
+        "chamadas": None, "proprio_ms": proprio[(arquivo, linha, nome)] * intervalo * 1000,
+        "acumulado_ms": total * intervalo * 1000,
+    } for (arquivo, linha, nome), total in acumulado.items()]
+
+def registrar_perfil(dataset, dados, filtros, modo, duracao, quadros):
+    gerador = geradores_figuras[dataset]
+    parametros = gerador.__code__.co_varnames[1:gerador.__code__.co_argcount]
+    por_modulo = Counter()
+    for quadro in quadros:
+        por_modulo[quadro["modulo"]] += quadro["proprio_ms"]
+    
+    perfil = {
+        "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "callback": gerador.__name__,
+        "versao": dados["versao"],
+        "filtros": {nome: normalizar_filtro(valores) for nome, valores in zip(parametros, filtros)},
+        "modo": modo,
+        "duracao_ms": round(duracao * 1000, 3),
+        "por_modulo": {modulo: round(tempo, 3) for modulo, tempo in por_modulo.most_common()},
+        "tempo_proprio": sorted(quadros, key=lambda q: q["proprio_ms"], reverse=True)[:quadros_perfil],
+        "tempo_acumulado": sorted(quadros, key=lambda q: q["acumulado_ms"], reverse=True)[:quadros_perfil],
+    }
+    
+    with lock_perfis:
+        perfis_recentes.append(perfil)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(caminho_perfis, "a", encoding="utf-8") as f:
+                f.write(json.dumps(perfil, default=str, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+def gerar_figuras_perfiladas(dataset, dados, filtros):
+    if perfil_solicitado():
+        perfilador = cProfile.Profile()
+        try:
+            perfilador.enable()
+        except ValueError:
+            return gerar_figuras(dataset, dados, filtros)
+        
+        inicio = time.perf_counter()
+        try:
+            serializado = gerar_figuras(dataset, dados, filtros, ler_cache=False)
+        finally:
+            perfilador.disable()
+        registrar_perfil(dataset, dados, filtros, "cprofile", time.perf_counter() - inicio, quadros_cprofile(perfilador))
+        return serializado
+    
+    if limite_perfil <= 0:
+        return gerar_figuras(dataset, dados, filtros)
+    
+    ident = threading.get_ident()
+    amostrador.iniciar(ident)
+    inicio = time.perf_counter()
+    try:
+        return gerar_figuras(dataset, dados, filtros)
+    finally:
+        duracao = time.perf_counter() - inicio
+        pilhas = amostrador.parar(ident)
+        if duracao >= limite_perfil and pilhas:
+            registrar_perfil(dataset, dados, filtros, "amostragem", duracao, quadros_amostras(pilhas, intervalo_amostragem))
+
+def com_cache_figuras(dataset):
+    def decorador(funcao):
+        geradores_figuras[dataset] = funcao
+        
+        @medir_callback
+        @functools.wraps(funcao)
+        def envoltorio(*filtros):
+            dados = dados_atuais
+            registrar_acesso(dataset, dados, filtros)
+            return responder_figuras(gerar_figuras_perfiladas(dataset, dados, filtros))
+        return envoltorio
+    return decorador
+
+acessos = Counter()
+lock_acessos = threading.Lock()
+caminho_acessos = os.path.join(cache_dir, "acessos.json")
+
+def registrar_acesso(dataset, dados, filtros):
+    validos = dados["metadados"][dataset]["valores_filtros"]
+    for valores, permitidos in zip(filtros, validos):
+        if valores and not (
+            isinstance(valores, list) and all(isinstance(valor, (str, int)) and valor in permitidos for valor in valores)
+        ):
+            return
+    
+    combinacao = json.dumps([dataset] + [normalizar_filtro(valores) for valores in filtros], default=str)
+    with lock_acessos:
+        if combinacao in acessos or len(acessos) < registro_acessos:
+            acessos[combinacao] += 1
+
+def ler_acessos():
+    conteudo = ler_json(caminho_acessos)
+    if "contagens" not in conteudo:
+        return time.time(), Counter(conteudo)
+    return conteudo.get("atualizado", time.time()), Counter(conteudo["contagens"])
+
+def salvar_acessos():
+    with lock_acessos:
+        novos = dict(acessos)
+        acessos.clear()
+    if not novos:
+        return
+    
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(caminho_acessos + ".lock", "w") as trava:
+            if fcntl is not None:
+                fcntl.flock(trava, fcntl.LOCK_EX)
+            
+            agora = time.time()
+            atualizado, anteriores = ler_acessos()
+            fator = decaimento_acessos ** (max(agora - atualizado, 0) / periodo_decaimento)
+            contagens = Counter({combinacao: total * fator for combinacao, total in anteriores.items()})
+            contagens.update(novos)
+            gravar_json(caminho_acessos, {"atualizado": agora, "contagens": dict(contagens.most_common(registro_acessos))})
+    except OSError:
+        pass
+
+def salvar_acessos_periodicamente():
+    while True:
+        time.sleep(intervalo_acessos)
+        salvar_acessos()
+
+def iniciar_registro_acessos():
+    threading.Thread(target=salvar_acessos_periodicamente, name="registro-acessos", daemon=True).start()
+
+def combinacoes_populares(limite):
+    _, contagens = ler_acessos()
+    with lock_acessos:
+        contagens.update(acessos)
+    return [json.loads(combinacao) for combinacao, _ in contagens.most_common(limite)]
+
+def aquecer_figuras(dados, populares=True):
+    salvar_acessos()
+    
+    combinacoes = [
+        [dataset] + [[]] * (funcao.__code__.co_argcount - 1)
+        for dataset, funcao in geradores_figuras.items()
+    ]
+    if populares:
+        combinacoes += combinacoes_populares(combinacoes_aquecimento)
+    
+    contexto_metricas.aquecimento = True
+    try:
+        for dataset, *filtros in combinacoes:
+            if dados_atuais is not dados:
+                return
+            if dataset not in geradores_figuras:
+                continue
+            
+            try:
+                if cache_figuras.obter(chave_figuras(dataset, dados["versao"], filtros)) is None:
+                    gerar_figuras(dataset, dados, filtros)
+            except Exception:
+                registro.exception("Falha ao pré-calcular %s %s", dataset, filtros)
+    finally:
+        contexto_metricas.aquecimento = False
+
+def iniciar_aquecimento(dados):
+    if aquecimento_ativo:
+        threading.Thread(target=aquecer_figuras, args=(dados,), name="aquecimento-figuras", daemon=True).start()
+
+atexit.register(salvar_acessos)
+atexit.register(gravar_metricas)
+
+def criar_layout_cursos():
     return html.Div(style=estilos['card'], children=[
         html.H3("📊 Avaliação de Cursos", style={'color': cores_ufpr['verde_principal'], 'marginBottom': '20px', 'textAlign': 'center'}),
         
         html.Div(style=estilos['filtros_container'], children=[
             html.Div([
                 html.Label("🔍 ID da Pesquisa", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-id-cursos']
+                dcc.Dropdown(id="filtro-id-cursos", options=[], multi=True)
             ], style={"width": "48%", "display": "inline-block", "padding": "10px", "marginRight": "2%"}),
 
             html.Div([
                 html.Label("📚 Curso", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-curso-cursos']
+                dcc.Dropdown(id="filtro-curso-cursos", options=[], multi=True)
             ], style={"width": "48%", "display": "inline-block", "padding": "10px", "marginLeft": "2%"}),
         ]),
 
         html.Div(style={'display': 'flex', 'justifyContent': 'space-between', 'gap': '20px'}, children=[
             html.Div(children=[
-                componentes_iniciais['grafico-satisfacao-cursos']
+                dcc.Graph(id="grafico-satisfacao-cursos")
             ], style=estilos['grafico_duplo']),
             
             html.Div(children=[
-                componentes_iniciais['grafico-distribuicao-cursos']
+                dcc.Graph(id="grafico-distribuicao-cursos")
             ], style=estilos['grafico_duplo']),
         ]),
         
         html.Div(children=[
-            componentes_iniciais['grafico-treemap-setores']
+            dcc.Graph(id="grafico-treemap-setores")
         ], style=estilos['treemap_container'])
     ])
 
 def criar_layout_presencial():
-    perguntas_unicas = sorted(df_presencial["PERGUNTA"].dropna().unique())
-    opcoes_perguntas = []
-
-    for i, pergunta in enumerate(perguntas_unicas, 1):
-        palavras = pergunta.split()[:6]
-        label_resumido = " ".join(palavras) + "..." if len(palavras) == 6 else pergunta
-        label_final = f"P{i}: {label_resumido}"
-        opcoes_perguntas.append({"label": label_final, "value": label_final})
-
-    componentes_iniciais['filtro-id-presencial'].options = [
-        {"label": str(id_pesquisa), "value": id_pesquisa} 
-        for id_pesquisa in sorted(df_presencial["ID_PESQUISA"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-curso-presencial'].options = [
-        {"label": c, "value": c} for c in sorted(df_presencial["CURSO"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-pergunta-presencial'].options = opcoes_perguntas
-
     return html.Div(style=estilos['card'], children=[
         html.H3("🎓 Disciplinas Presenciais", style={'color': cores_ufpr['verde_principal'], 'marginBottom': '20px', 'textAlign': 'center'}),
         
         html.Div(style=estilos['filtros_container'], children=[
             html.Div([
                 html.Label("🔍 ID da Pesquisa", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-id-presencial']
+                dcc.Dropdown(id="filtro-id-presencial", options=[], multi=True)
             ], style={"width": "30%", "display": "inline-block", "padding": "10px"}),
 
             html.Div([
                 html.Label("📚 Curso", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-curso-presencial']
+                dcc.Dropdown(id="filtro-curso-presencial", options=[], multi=True)
             ], style={"width": "30%", "display": "inline-block", "padding": "10px"}),
 
             html.Div([
                 html.Label("❓ Pergunta", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-pergunta-presencial']
+                dcc.Dropdown(id="filtro-pergunta-presencial", options=[], multi=True)
             ], style={"width": "40%", "display": "inline-block", "padding": "10px"}),
         ]),
 
         html.Div(children=[
-            componentes_iniciais['grafico-likert-presencial']
+            dcc.Graph(id="grafico-likert-presencial")
         ], style=estilos['grafico_principal']),
         
         html.Div(style={'display': 'flex', 'justifyContent': 'space-between', 'gap': '20px'}, children=[
             html.Div(children=[
-                componentes_iniciais['grafico-satisfacao-presencial']
+                dcc.Graph(id="grafico-satisfacao-presencial")
             ], style=estilos['grafico_duplo']),
             
             html.Div(children=[
-                componentes_iniciais['grafico-treemap-departamentos']
+                dcc.Graph(id="grafico-treemap-departamentos")
             ], style=estilos['grafico_duplo']),
         ])
     ])
 
 def criar_layout_ead():
-    perguntas_unicas = sorted(df_ead["PERGUNTA"].dropna().unique())
-    opcoes_perguntas = []
-
-    for i, pergunta in enumerate(perguntas_unicas, 1):
-        palavras = pergunta.split()[:6]
-        label_resumido = " ".join(palavras) + "..." if len(palavras) == 6 else pergunta
-        label_final = f"P{i}: {label_resumido}"
-        opcoes_perguntas.append({"label": label_final, "value": label_final})
-
-    componentes_iniciais['filtro-id-ead'].options = [
-        {"label": str(id_pesquisa), "value": id_pesquisa} 
-        for id_pesquisa in sorted(df_ead["ID_PESQUISA"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-programa-ead'].options = [
-        {"label": c, "value": c} for c in sorted(df_ead["CURSO"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-pergunta-ead'].options = opcoes_perguntas
-
     return html.Div(style=estilos['card'], children=[
         html.H3("💻 Disciplinas EAD", style={'color': cores_ufpr['verde_principal'], 'marginBottom': '20px', 'textAlign': 'center'}),
         
         html.Div(style=estilos['filtros_container'], children=[
             html.Div([
                 html.Label("🔍 ID da Pesquisa", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-id-ead']
+                dcc.Dropdown(id="filtro-id-ead", options=[], multi=True)
             ], style={"width": "30%", "display": "inline-block", "padding": "10px"}),
 
             html.Div([
                 html.Label("🎯 Programa EAD", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-programa-ead']
+                dcc.Dropdown(id="filtro-programa-ead", options=[], multi=True)
             ], style={"width": "30%", "display": "inline-block", "padding": "10px"}),
 
             html.Div([
                 html.Label("❓ Pergunta", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-pergunta-ead']
+                dcc.Dropdown(id="filtro-pergunta-ead", options=[], multi=True)
             ], style={"width": "40%", "display": "inline-block", "padding": "10px"}),
         ]),
 
         html.Div(children=[
-            componentes_iniciais['grafico-distribuicao-disciplinas-ead']
+            dcc.Graph(id="grafico-distribuicao-disciplinas-ead")
         ], style=estilos['grafico_principal']),
         
         html.Div(style={'display': 'flex', 'justifyContent': 'space-between', 'gap': '20px'}, children=[
             html.Div(children=[
-                componentes_iniciais['grafico-satisfacao-ead']
+                dcc.Graph(id="grafico-satisfacao-ead")
             ], style=estilos['grafico_duplo']),
             
             html.Div(children=[
-                componentes_iniciais['grafico-treemap-disciplinas-ead']
+                dcc.Graph(id="grafico-treemap-disciplinas-ead")
             ], style=estilos['grafico_duplo']),
         ])
     ])
 
 def criar_layout_institucional():
-    if "LOTACAO" in df_institucional.columns:
-        unidades_unicas = sorted(df_institucional["LOTACAO"].dropna().unique())
-    else:
-        unidades_unicas = sorted(df_institucional["SIGLA_LOTACAO"].dropna().unique())
-    
-    componentes_iniciais['filtro-id-institucional'].options = [
-        {"label": str(id_pesquisa), "value": id_pesquisa} 
-        for id_pesquisa in sorted(df_institucional["ID_PESQUISA"].dropna().unique())
-    ]
-    componentes_iniciais['filtro-unidade-institucional'].options = [
-        {"label": c, "value": c} for c in unidades_unicas
-    ]
-
     return html.Div(style=estilos['card'], children=[
         html.H3("🏛️ Avaliação Institucional", style={'color': cores_ufpr['verde_principal'], 'marginBottom': '20px', 'textAlign': 'center'}),
         
         html.Div(style=estilos['filtros_container'], children=[
             html.Div([
                 html.Label("🔍 ID da Pesquisa", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-id-institucional']
+                dcc.Dropdown(id="filtro-id-institucional", options=[], multi=True)
             ], style={"width": "48%", "display": "inline-block", "padding": "10px", "marginRight": "2%"}),
 
             html.Div([
                 html.Label("🏢 Unidade", style={'fontWeight': '600', 'marginBottom': '5px'}),
-                componentes_iniciais['filtro-unidade-institucional']
+                dcc.Dropdown(id="filtro-unidade-institucional", options=[], multi=True)
             ], style={"width": "48%", "display": "inline-block", "padding": "10px", "marginLeft": "2%"}),
         ]),
 
         html.Div(style={'display': 'flex', 'justifyContent': 'space-between', 'gap': '20px'}, children=[
             html.Div(children=[
-                componentes_iniciais['grafico-satisfacao-institucional']
+                dcc.Graph(id="grafico-satisfacao-institucional")
             ], style=estilos['grafico_duplo']),
             
             html.Div(children=[
-                componentes_iniciais['grafico-distribuicao-unidades-institucional']
+                dcc.Graph(id="grafico-distribuicao-unidades-institucional")
             ], style=estilos['grafico_duplo']),
         ]),
         
         html.Div(children=[
-            componentes_iniciais['grafico-treemap-unidades-institucional']
+            dcc.Graph(id="grafico-treemap-unidades-institucional")
         ], style=estilos['treemap_container'])
     ])
 
+def serializar_layout(layout):
+    return json.loads(to_json_plotly(layout))
+
+layouts_abas = {
+    'tab-cursos': serializar_layout(criar_layout_cursos()),
+    'tab-presencial': serializar_layout(criar_layout_presencial()),
+    'tab-ead': serializar_layout(criar_layout_ead()),
+    'tab-institucional': serializar_layout(criar_layout_institucional()),
+}
+
 app.layout = html.Div(style=estilos['container_principal'], children=[
     html.Div(style=estilos['header'], children=[
         html.H1("Dashboard de Pesquisas UFPR", style=estilos['titulo_principal']),
@@ -1178,21 +2294,77 @@ app.layout = html.Div(style=estilos['container_principal'], children=[
     html.Div(id="conteudo-tab")
 ])
 
-@app.callback(
+layouts_abas_json = {aba: json.dumps(layout) for aba, layout in layouts_abas.items()}
+erro_aba_json = json.dumps(serializar_layout(html.Div("Não foi possível carregar a aba. Troque de aba e volte para tentar de novo.")))
+
+@server.route("/_dash-abas/<tab_selecionada>")
+@medir_callback
+def render_conteudo(tab_selecionada):
+    if tab_selecionada in layouts_abas_json:
+        conteudo = layouts_abas_json[tab_selecionada]
+    else:
+        conteudo = json.dumps(serializar_layout(html.Div("Selecione uma aba")))
+    return conteudo, 200, {"Content-Type": "application/json"}
+
+app.clientside_callback(
+    f"""
+    function(tab_selecionada) {{
+        return fetch("{app.get_relative_path('/_dash-abas/')}" + encodeURIComponent(tab_selecionada), {{cache: "no-cache"}})
+            .then(function(resposta) {{
+                if (!resposta.ok) {{
+                    throw new Error(resposta.status);
+                }}
+                return resposta.json();
+            }})
+            .catch(function() {{ return {erro_aba_json}; }});
+    }}
+    """,
     Output("conteudo-tab", "children"),
     Input("tabs-principais", "value")
 )
-def render_conteudo(tab_selecionada):
-    if tab_selecionada == 'tab-presencial':
-        return criar_layout_presencial()
-    elif tab_selecionada == 'tab-cursos':
-        return criar_layout_cursos()
-    elif tab_selecionada == 'tab-ead':
-        return criar_layout_ead()
-    elif tab_selecionada == 'tab-institucional':
-        return criar_layout_institucional()
-    else:
-        return html.Div("Selecione uma aba")
+
+filtros_abas = {
+    "cursos": [("filtro-id-cursos", "opcoes_ids"), ("filtro-curso-cursos", "opcoes_cursos")],
+    "presencial": [
+        ("filtro-id-presencial", "opcoes_ids"),
+        ("filtro-pergunta-presencial", "opcoes_perguntas"),
+    ],
+    "ead": [
+        ("filtro-id-ead", "opcoes_ids"),
+        ("filtro-pergunta-ead", "opcoes_perguntas"),
+    ],
+    "institucional": [("filtro-id-institucional", "opcoes_ids"), ("filtro-unidade-institucional", "opcoes_cursos")],
+}
+
+def criar_callback_opcoes(dataset, filtros):
+    def enviar_opcoes(_):
+        return [dados_atuais["metadados"][dataset][chave] for _, chave in filtros]
+    return enviar_opcoes
+
+for dataset, filtros in filtros_abas.items():
+    app.callback(
+        [Output(id_filtro, "options") for id_filtro, _ in filtros],
+        Input(filtros[0][0], "id"),
+    )(criar_callback_opcoes(dataset, filtros))
+
+filtros_com_busca = {
+    "presencial": "filtro-curso-presencial",
+    "ead": "filtro-programa-ead",
+}
+
+def criar_callback_busca(dataset):
+    def buscar_opcoes(termo, selecionados):
+        selecionados = selecionados or []
+        encontrados = buscar_nomes(dados_atuais["metadados"][dataset]["busca_cursos"], termo, limite_busca_opcoes)
+        return [opcao_com_busca(nome) for nome in selecionados + [n for n in encontrados if n not in selecionados]]
+    return buscar_opcoes
+
+for dataset, id_filtro in filtros_com_busca.items():
+    app.callback(
+        Output(id_filtro, "options"),
+        Input(id_filtro, "search_value"),
+        State(id_filtro, "value"),
+    )(criar_callback_busca(dataset))
 
 @app.callback(
     Output("grafico-satisfacao-cursos", "figure"),
@@ -1201,13 +2373,11 @@ def render_conteudo(tab_selecionada):
     Input("filtro-id-cursos", "value"),
     Input("filtro-curso-cursos", "value"),
 )
-def atualizar_graficos_cursos(ids, cursos):
-    dff = df_cursos.copy()
-    
-    if ids: 
-        dff = dff[dff["ID_PESQUISA"].isin(ids)]
-    if cursos: 
-        dff = dff[dff["CURSO"].isin(cursos)]
+@com_cache_figuras("cursos")
+def atualizar_graficos_cursos(dados, ids, cursos):
+    cubo = dados["cubos"]["cursos"]
+    fatos = filtrar_linhas(cubo, [("ID_PESQUISA", ids), ("CURSO", cursos)])
+    dff = agregar_respostas("cursos", cubo, fatos)
     
     fig_satisfacao = criar_grafico_satisfacao_geral(dff)
     fig_distribuicao_cursos = criar_grafico_distribuicao_cursos(dff)
@@ -1223,23 +2393,13 @@ def atualizar_graficos_cursos(ids, cursos):
     Input("filtro-curso-presencial", "value"),
     Input("filtro-pergunta-presencial", "value"),
 )
-def atualizar_graficos_presencial(ids, cursos, perguntas_selecionadas):
-    dff = df_presencial.copy()
-    
-    if ids: 
-        dff = dff[dff["ID_PESQUISA"].isin(ids)]
-    if cursos: 
-        dff = dff[dff["CURSO"].isin(cursos)]
-    
-    perguntas_unicas = sorted(df_presencial["PERGUNTA"].dropna().unique())
-    mapeamento_perguntas = {}
-    for i, pergunta in enumerate(perguntas_unicas, 1):
-        palavras = pergunta.split()[:6]
-        label_resumido = " ".join(palavras) + "..." if len(palavras) == 6 else pergunta
-        label_final = f"P{i}: {label_resumido}"
-        mapeamento_perguntas[label_final] = pergunta
+@com_cache_figuras("presencial")
+def atualizar_graficos_presencial(dados, ids, cursos, perguntas_selecionadas):
+    cubo = dados["cubos"]["presencial"]
+    fatos = filtrar_linhas(cubo, [("ID_PESQUISA", ids), ("CURSO", cursos)])
+    dff = agregar_respostas("presencial", cubo, fatos)
     
-    fig_likert = criar_grafico_likert(dff, perguntas_selecionadas, mapeamento_perguntas)
+    fig_likert = criar_grafico_likert(dff, perguntas_selecionadas, dados["metadados"]["presencial"]["mapeamento_perguntas"])
     fig_satisfacao = criar_grafico_satisfacao_geral(dff)
     fig_treemap = criar_grafico_treemap_departamento(dff)
     
@@ -1253,13 +2413,11 @@ def atualizar_graficos_presencial(ids, cursos, perguntas_selecionadas):
     Input("filtro-programa-ead", "value"),
     Input("filtro-pergunta-ead", "value"),
 )
-def atualizar_graficos_ead(ids, programas, perguntas_selecionadas):
-    dff = df_ead.copy()
-    
-    if ids: 
-        dff = dff[dff["ID_PESQUISA"].isin(ids)]
-    if programas: 
-        dff = dff[dff["CURSO"].isin(programas)]
+@com_cache_figuras("ead")
+def atualizar_graficos_ead(dados, ids, programas, perguntas_selecionadas):
+    cubo = dados["cubos"]["ead"]
+    fatos = filtrar_linhas(cubo, [("ID_PESQUISA", ids), ("CURSO", programas)])
+    dff = agregar_respostas("ead", cubo, fatos)
     
     fig_distribuicao_disciplinas = criar_grafico_distribuicao_disciplinas_ead(dff)
     fig_satisfacao = criar_grafico_satisfacao_geral(dff)
@@ -1274,17 +2432,13 @@ def atualizar_graficos_ead(ids, programas, perguntas_selecionadas):
     Input("filtro-id-institucional", "value"),
     Input("filtro-unidade-institucional", "value"),
 )
-def atualizar_graficos_institucional(ids, unidades):
-    dff = df_institucional.copy()
-    
-    if ids: 
-        dff = dff[dff["ID_PESQUISA"].isin(ids)]
-    if unidades: 
-        if "LOTACAO" in dff.columns:
-            coluna_unidade = "LOTACAO"
-        else:
-            coluna_unidade = "SIGLA_LOTACAO"
-        dff = dff[dff[coluna_unidade].isin(unidades)]
+@com_cache_figuras("institucional")
+def atualizar_graficos_institucional(dados, ids, unidades):
+    cubo = dados["cubos"]["institucional"]
+    fatos = filtrar_linhas(cubo, [
+        ("ID_PESQUISA", ids), (dados["colunas_curso"]["institucional"], unidades)
+    ])
+    dff = agregar_respostas("institucional", cubo, fatos)
     
     fig_satisfacao = criar_grafico_satisfacao_geral(dff)
     fig_distribuicao = criar_grafico_distribuicao_unidades_institucional(dff)
@@ -1292,5 +2446,19 @@ def atualizar_graficos_institucional(ids, unidades):
     
     return fig_satisfacao, fig_distribuicao, fig_treemap_unidades
 
+if "--construir-cache" not in sys.argv:
+    if carregar_no_master:
+        fixar_particoes(dados_atuais)
+        if aquecimento_ativo:
+            aquecer_figuras(dados_atuais, populares=False)
+    else:
+        iniciar_monitoramento()
+        iniciar_gravacao_metricas()
+        iniciar_registro_acessos()
+        iniciar_aquecimento(dados_atuais)
+
 if __name__ == "__main__":
+    if "--construir-cache" in sys.argv:
+        sys.exit(0)
+    
     app.run(debug=False, host='0.0.0.0', port=8050, dev_tools_silence_routes_logging=True)
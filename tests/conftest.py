@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import importlib
+import shutil
+import sys
+import os
+
+import pytest
+
+raiz_projeto = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+tabelas_referencia = os.path.join(raiz_projeto, "clean_data")
+
+respostas_teste = np.array(["Concordo", "Desconheço", "Discordo", "Não se aplica", None], dtype=object)
+proporcoes_teste = [0.7, 0.08, 0.14, 0.04, 0.04]
+
+exportacoes = {
+    "presenciais_dadosavdisciplinas.csv": (
+        "presenciais_perguntas.csv", "presenciais_disciplinas.csv",
+        ["COD_DISCIPLINA", "NOME_DISCIPLINA", "COD_CURSO", "CURSO", "SETOR_CURSO"],
+    ),
+    "cursos_dadosavcursos.csv": ("cursos_perguntas.csv", "cursos_curso.csv", ["COD_CURSO", "CURSO", "SETOR_CURSO"]),
+    "ead_pesq423_discip.csv": (
+        "ead_perguntas.csv", "ead_disciplinas.csv",
+        ["COD_DISCIPLINA", "NOME_DISCIPLINA", "COD_CURSO", "MULTIPLA_ESCOLHA", "CURSO", "SETOR_CURSO"],
+    ),
+    "institucional_pesquisa_442.csv": ("institucional_perguntas.csv", "institucional_unidades.csv", ["SIGLA_LOTACAO", "LOTACAO"]),
+}
+
+def ler_tabela(arquivo):
+    return pd.read_csv(os.path.join(tabelas_referencia, arquivo))
+
+def sortear(rng, tabela, quantidade):
+    return tabela.iloc[rng.integers(0, len(tabela), quantidade)].reset_index(drop=True)
+
+def gerar_respostas(pasta, linhas, semente=0):
+    rng = np.random.default_rng(semente)
+    unidades = ler_tabela("institucional_unidades.csv")
+    departamentos = unidades.loc[unidades["LOTACAO"].str.startswith("Departamento"), "LOTACAO"].drop_duplicates().to_numpy()
+    
+    for arquivo, (arquivo_perguntas, arquivo_cadastro, colunas) in exportacoes.items():
+        perguntas = ler_tabela(arquivo_perguntas)
+        titulo = "QUESTIONARIO" if "QUESTIONARIO" in perguntas.columns else "TITULO"
+        perguntas = perguntas[["ID_QUESTIONARIO", titulo, "ID_PERGUNTA", "PERGUNTA"]].rename(columns={titulo: "QUESTIONARIO"})
+        
+        df = sortear(rng, perguntas, linhas)
+        df.insert(0, "ID_PESQUISA", rng.choice(40001 + np.arange(4), linhas))
+        df["RESPOSTA"] = respostas_teste[rng.choice(len(respostas_teste), linhas, p=proporcoes_teste)]
+        df["SITUACAO"] = "Fim respostas"
+        df = pd.concat([df, sortear(rng, ler_tabela(arquivo_cadastro)[colunas], linhas)], axis=1)
+        if "COD_DISCIPLINA" in colunas:
+            df["DEPARTAMENTO"] = rng.choice(departamentos, linhas)
+        df.to_csv(os.path.join(pasta, arquivo), index=False)
+
+@pytest.fixture(scope="session")
+def painel(tmp_path_factory):
+    pasta = tmp_path_factory.mktemp("painel")
+    dados = pasta / "dados"
+    dados.mkdir()
+    for arquivo in os.listdir(tabelas_referencia):
+        if arquivo.endswith(".csv"):
+            shutil.copy(os.path.join(tabelas_referencia, arquivo), dados)
+    gerar_respostas(str(dados), 3000)
+    
+    variaveis = {
+        "DASHBOARD_DADOS_DIR": str(dados),
+        "DASHBOARD_CACHE_DIR": str(pasta / "cache"),
+        "DASHBOARD_CACHE_BACKEND": "memoria",
+        "DASHBOARD_AQUECIMENTO": "0",
+        "DASHBOARD_RECARGA_INTERVALO": "0",
+    }
+    anteriores = {nome: os.environ.get(nome) for nome in variaveis}
+    os.environ.update(variaveis)
+    sys.path.insert(0, os.path.join(raiz_projeto, "src"))
+    try:
+        yield importlib.import_module("app")
+    finally:
+        sys.stderr = sys.__stderr__
+        for nome, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
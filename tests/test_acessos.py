@@ -0,0 +1,46 @@
+import json
+import time
+
+def test_registra_apenas_valores_conhecidos(painel, monkeypatch):
+    monkeypatch.setattr(painel, "acessos", painel.Counter())
+    dados = painel.dados_atuais
+    id_valido = dados["metadados"]["cursos"]["opcoes_ids"][0]["value"]
+    
+    painel.registrar_acesso("cursos", dados, ([id_valido], None))
+    painel.registrar_acesso("cursos", dados, ([id_valido], ["Curso que não existe"]))
+    painel.registrar_acesso("cursos", dados, ([{"x": 1}], None))
+    painel.registrar_acesso("cursos", dados, (12, None))
+    
+    assert list(painel.acessos.values()) == [1]
+
+def test_limita_combinacoes_entre_gravacoes(painel, monkeypatch):
+    monkeypatch.setattr(painel, "acessos", painel.Counter())
+    monkeypatch.setattr(painel, "registro_acessos", 2)
+    dados = painel.dados_atuais
+    ids = [opcao["value"] for opcao in dados["metadados"]["cursos"]["opcoes_ids"]]
+    
+    for id_pesquisa in ids:
+        painel.registrar_acesso("cursos", dados, ([id_pesquisa], None))
+    painel.registrar_acesso("cursos", dados, ([ids[0]], None))
+    
+    assert len(painel.acessos) == 2
+    assert painel.acessos[json.dumps(["cursos", [ids[0]], []])] == 2
+
+def test_decaimento_depende_do_tempo_decorrido(painel, monkeypatch, tmp_path):
+    caminho = str(tmp_path / "acessos.json")
+    monkeypatch.setattr(painel, "caminho_acessos", caminho)
+    monkeypatch.setattr(painel, "acessos", painel.Counter())
+    antiga = json.dumps(["cursos", [], []])
+    nova = json.dumps(["cursos", [1], []])
+    
+    painel.gravar_json(caminho, {"atualizado": time.time() - painel.periodo_decaimento, "contagens": {antiga: 10}})
+    painel.acessos[nova] = 1
+    painel.salvar_acessos()
+    contagens = painel.ler_acessos()[1]
+    assert abs(contagens[antiga] - 10 * painel.decaimento_acessos) < 0.01
+    
+    painel.acessos[nova] = 1
+    painel.salvar_acessos()
+    contagens = painel.ler_acessos()[1]
+    assert abs(contagens[antiga] - 10 * painel.decaimento_acessos) < 0.01
+    assert abs(contagens[nova] - 2) < 0.01
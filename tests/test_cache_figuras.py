@@ -0,0 +1,115 @@
+import pytest
+
+class ClienteDicionario:
+    def __init__(self):
+        self.valores = {}
+    
+    def get(self, chave):
+        return self.valores.get(chave)
+    
+    def set(self, chave, valor, ex=None):
+        self.valores[chave] = valor.encode("utf-8")
+
+class ClienteIndisponivel:
+    def get(self, chave):
+        raise ConnectionError("sem conexão")
+    
+    def set(self, chave, valor, ex=None):
+        raise ConnectionError("sem conexão")
+
+def test_acerto_no_redis_e_copiado_para_o_lru_local(painel):
+    cliente = ClienteDicionario()
+    cache = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheRedis(cliente))
+    cache.definir_versao("v1")
+    cliente.set("dashboard:figuras:abc", "[1, 2]")
+    
+    assert cache.obter("abc") == "[1, 2]"
+    assert cache.local.obter("abc") == "[1, 2]"
+    
+    cliente.valores.clear()
+    assert cache.obter("abc") == "[1, 2]"
+
+def test_guardar_grava_nas_duas_camadas(painel):
+    cliente = ClienteDicionario()
+    cache = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheRedis(cliente, expiracao=60))
+    cache.guardar("abc", "[3]")
+    
+    assert cache.local.obter("abc") == "[3]"
+    assert cliente.valores["dashboard:figuras:abc"] == b"[3]"
+
+def test_troca_de_versao_limpa_o_lru_local(painel):
+    cliente = ClienteDicionario()
+    cache = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheRedis(cliente))
+    cache.definir_versao("v1")
+    cache.guardar("abc", "[1]")
+    
+    cache.definir_versao("v2")
+    assert cache.local.obter("abc") is None
+
+def test_sqlite_compartilha_entre_instancias_e_limpa_por_versao(painel, tmp_path):
+    caminho = str(tmp_path / "figuras.sqlite")
+    primeiro = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheSQLite(caminho, 10))
+    segundo = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheSQLite(caminho, 10))
+    primeiro.definir_versao("v1")
+    segundo.definir_versao("v1")
+    
+    primeiro.guardar("abc", "[1]")
+    assert segundo.obter("abc") == "[1]"
+    assert segundo.local.obter("abc") == "[1]"
+    
+    segundo.definir_versao("v2")
+    assert segundo.obter("abc") is None
+    assert primeiro.compartilhado.obter("abc") is None
+
+def test_sqlite_respeita_o_tamanho_maximo(painel, tmp_path):
+    cache = painel.CacheSQLite(str(tmp_path / "figuras.sqlite"), 2)
+    cache.definir_versao("v1")
+    for chave in ("a", "b", "c"):
+        cache.guardar(chave, chave)
+    
+    restantes = [chave for chave in ("a", "b", "c") if cache.obter(chave) is not None]
+    assert len(restantes) == 2
+
+def test_erros_do_redis_contam_como_falta(painel):
+    cache = painel.CacheEmCamadas(painel.CacheFiguras(4), painel.CacheRedis(ClienteIndisponivel()))
+    
+    assert cache.obter("abc") is None
+    cache.guardar("abc", "[1]")
+    assert cache.obter("abc") == "[1]"
+
+def test_erros_do_sqlite_contam_como_falta(painel, tmp_path):
+    compartilhado = painel.CacheSQLite(str(tmp_path / "figuras.sqlite"), 10)
+    compartilhado.conexao().execute("DROP TABLE figuras")
+    cache = painel.CacheEmCamadas(painel.CacheFiguras(4), compartilhado)
+    
+    cache.definir_versao("v1")
+    assert cache.obter("abc") is None
+    cache.guardar("abc", "[1]")
+    assert cache.obter("abc") == "[1]"
+
+def test_acerto_devolve_as_figuras_guardadas_sem_reserializar(painel, monkeypatch):
+    chamadas = []
+    serializar = painel.serializar_figuras
+    monkeypatch.setattr(painel, "serializar_figuras", lambda figuras: chamadas.append(1) or serializar(figuras))
+    saidas = ["grafico-satisfacao-cursos", "grafico-distribuicao-cursos", "grafico-treemap-setores"]
+    corpo = {
+        "output": ".." + "...".join(f"{saida}.figure" for saida in saidas) + "..",
+        "outputs": [{"id": saida, "property": "figure"} for saida in saidas],
+        "inputs": [
+            {"id": "filtro-id-cursos", "property": "value", "value": [1]},
+            {"id": "filtro-curso-cursos", "property": "value", "value": None},
+        ],
+        "changedPropIds": [],
+        "state": [],
+    }
+    cliente = painel.server.test_client()
+    
+    falta = cliente.post("/_dash-update-component", json=corpo, headers={"Accept-Encoding": "identity"})
+    acerto = cliente.post("/_dash-update-component", json=corpo, headers={"Accept-Encoding": "identity"})
+    
+    assert falta.status_code == acerto.status_code == 200
+    assert len(chamadas) == 1
+    assert falta.get_json() == acerto.get_json()
+    figuras = acerto.get_json()["response"]
+    assert sorted(figuras) == sorted(saidas)
+    assert all("layout" in figuras[saida]["figure"] for saida in saidas)
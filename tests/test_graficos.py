@@ -0,0 +1,33 @@
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
+import json
+
+def barras_px(painel, dados, coluna, rotulo):
+    return px.bar(
+        dados,
+        x="Percentual",
+        y=coluna,
+        color="RESPOSTA",
+        barmode="stack",
+        labels={coluna: rotulo, "Percentual": "Percentual de Respostas (%)", "RESPOSTA": "Resposta"},
+        color_discrete_map=painel.cores_respostas,
+        hover_data={"Quantidade": True, "Percentual": True},
+    )
+
+def test_barras_empilhadas_iguais_ao_px_com_respostas_fora_da_escala(painel):
+    dados = pd.DataFrame({
+        "CURSO": ["A", "A", "A", "A", "B", "B", "B"],
+        "RESPOSTA": pd.Categorical(
+            ["Concordo", "Não se aplica", "Discordo", "Desconheço", None, "Concordo", "Discordo"],
+            categories=painel.ordem_likert, ordered=True,
+        ),
+        "Quantidade": [5, 1, 2, 2, 1, 4, 3],
+        "Percentual": [50.0, 10.0, 20.0, 20.0, 12.5, 50.0, 37.5],
+    })
+    
+    esperado = json.loads(barras_px(painel, dados, "CURSO", "Curso").to_json())["data"]
+    obtido = json.loads(go.Figure(data=painel.tracos_barras_empilhadas(dados, "CURSO", "Curso")).to_json())["data"]
+    
+    assert [traco["name"] for traco in obtido] == ["Concordo", "Discordo", "Desconheço"]
+    assert obtido == esperado